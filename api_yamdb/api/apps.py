@@ -3,3 +3,12 @@ from django.apps import AppConfig
 
 class ApiConfig(AppConfig):
     name = "api"
+
+    def ready(self):
+        from . import (  # noqa: F401
+            authentication,
+            cache,
+            conditional,
+            genre_index,
+            sqlite,
+        )
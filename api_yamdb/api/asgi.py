@@ -0,0 +1,150 @@
+from concurrent.futures import ThreadPoolExecutor
+from io import SEEK_END, BytesIO
+from tempfile import SpooledTemporaryFile
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+# Тело запроса больше этого размера записывается во временный файл.
+MAX_BODY_IN_MEMORY = 64 * 1024
+
+executor = None
+
+
+def get_executor():
+    global executor
+    if executor is None:
+        executor = ThreadPoolExecutor(
+            max_workers=settings.ASGI_THREADS,
+            thread_name_prefix="asgi",
+        )
+    return executor
+
+
+class ASGIHandler:
+    """
+    ASGI-приложение поверх WSGI-обработчика Django.
+
+    В Django 2.2 нет асинхронных представлений, поэтому запрос
+    обрабатывается в пуле из ASGI_THREADS потоков, но поток занят
+    только на время работы представления: тело запроса читается,
+    а готовый ответ отправляется клиенту в цикле событий. Медленные
+    клиенты не держат потоки, и один процесс обслуживает столько
+    соединений, сколько выдерживает цикл событий.
+
+    Ответ собирается в памяти целиком; API отдает небольшие JSON,
+    потоковых ответов у него нет.
+    """
+
+    def __init__(self, wsgi_application, executor=None):
+        self.wsgi_application = wsgi_application
+        self.executor = executor
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self.lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            raise ValueError(f"Неподдерживаемое соединение {scope['type']}")
+        with SpooledTemporaryFile(max_size=MAX_BODY_IN_MEMORY) as body:
+            while True:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    return
+                body.write(message.get("body", b""))
+                if not message.get("more_body"):
+                    break
+            status, headers, content = await sync_to_async(
+                self.run_wsgi_app,
+                thread_sensitive=False,
+                executor=self.executor or get_executor(),
+            )(scope, body)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": headers,
+            }
+        )
+        if scope["method"] == "HEAD":
+            content = b""
+        await send({"type": "http.response.body", "body": content})
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def run_wsgi_app(self, scope, body):
+        """
+        Выполняется в потоке пула: вызывает WSGI-обработчик и
+        возвращает статус, заголовки и тело ответа.
+        """
+
+        started = {}
+
+        def start_response(status, response_headers, exc_info=None):
+            started["status"] = int(status.split(" ", 1)[0])
+            started["headers"] = [
+                (name.lower().encode("latin1"), value.encode("latin1"))
+                for name, value in response_headers
+            ]
+
+        response = self.wsgi_application(
+            self.build_environ(scope, body), start_response
+        )
+        try:
+            content = b"".join(response)
+        finally:
+            # Закрытие ответа отправляет request_finished, и Django
+            # закрывает соединение с БД в этом же потоке.
+            if hasattr(response, "close"):
+                response.close()
+        return started["status"], started["headers"], content
+
+    def build_environ(self, scope, body):
+        """
+        Окружение WSGI из ASGI scope.
+        """
+
+        server = scope.get("server") or ("localhost", 80)
+        body.seek(0, SEEK_END)
+        content_length = body.tell()
+        body.seek(0)
+        environ = {
+            "REQUEST_METHOD": scope["method"],
+            "SCRIPT_NAME": scope.get("root_path", "")
+            .encode("utf8")
+            .decode("latin1"),
+            "PATH_INFO": scope["path"].encode("utf8").decode("latin1"),
+            "QUERY_STRING": scope.get("query_string", b"").decode("latin1"),
+            "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+            "SERVER_NAME": server[0],
+            "SERVER_PORT": str(server[1]),
+            # Тело уже прочитано целиком, в том числе при chunked.
+            "CONTENT_LENGTH": str(content_length),
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": scope.get("scheme", "http"),
+            "wsgi.input": body,
+            "wsgi.errors": BytesIO(),
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": True,
+            "wsgi.run_once": False,
+        }
+        if scope.get("client"):
+            environ["REMOTE_ADDR"] = scope["client"][0]
+        for name, value in scope.get("headers", ()):
+            name = name.decode("latin1").upper().replace("-", "_")
+            if name == "CONTENT_LENGTH":
+                continue
+            if name != "CONTENT_TYPE":
+                name = f"HTTP_{name}"
+            value = value.decode("latin1")
+            if name in environ:
+                value = f"{environ[name]},{value}"
+            environ[name] = value
+        return environ
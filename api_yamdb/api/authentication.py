@@ -0,0 +1,79 @@
+import copy
+import threading
+import time
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from reviews.models import User
+
+# При переполнении кеш очищается целиком.
+MAX_USERS = 10000
+
+
+class UserCache:
+    """
+    Пользователи по id в памяти процесса на JWT_USER_CACHE_TTL секунд.
+
+    Сохранение или удаление пользователя в этом процессе сразу
+    сбрасывает его запись; изменения из других процессов видны
+    не позже чем через TTL.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.users = {}
+
+    def get(self, user_id):
+        entry = self.users.get(user_id)
+        if entry is None or entry[1] < time.monotonic():
+            return None
+        return entry[0]
+
+    def set(self, user_id, user):
+        expires = time.monotonic() + settings.JWT_USER_CACHE_TTL
+        with self.lock:
+            if len(self.users) >= MAX_USERS:
+                self.users.clear()
+            self.users[user_id] = (user, expires)
+
+    def invalidate(self, user_id):
+        with self.lock:
+            self.users.pop(user_id, None)
+
+    def clear(self):
+        with self.lock:
+            self.users.clear()
+
+
+user_cache = UserCache()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication, который берет пользователя из UserCache вместо
+    запроса к БД на каждый запрос. При JWT_USER_CACHE_TTL = 0 работает
+    как JWTAuthentication.
+    """
+
+    def get_user(self, validated_token):
+        if not settings.JWT_USER_CACHE_TTL:
+            return super().get_user(validated_token)
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        user = user_cache.get(user_id)
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.set(user_id, user)
+        # Запрос может изменить request.user, общий объект — нет.
+        user = copy.copy(user)
+        user._state = copy.copy(user._state)
+        user._state.fields_cache = {}
+        return user
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(instance, **kwargs):
+    user_cache.invalidate(instance.pk)
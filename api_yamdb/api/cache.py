@@ -0,0 +1,187 @@
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from reviews.models import Category, Genre, Review, Title
+
+from .conditional import EPOCH, bump_versions
+
+TITLE_DETAIL_VERSION_KEY = "title_detail_version"
+
+
+class LookupCache:
+    """
+    Все объекты небольшой справочной таблицы (категории, жанры)
+    в памяти процесса: список и словарь slug -> объект.
+
+    Перед использованием проверяется версия в кеше Django — одно
+    обращение к кешу вместо запроса к БД. Запись в таблицу меняет
+    версию, и каждый процесс перечитывает таблицу при следующем
+    обращении. При кеше в памяти процесса другие процессы версию не
+    видят, поэтому таблица перечитывается и по истечении
+    LOOKUP_CACHE_TTL секунд, неизвестный slug ищется в БД, а перед
+    записью произведения объекты из кеша проверяются в БД
+    (CachedSlugRelatedField.check_exists).
+    Объекты общие для всех запросов, изменять их нельзя.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.version_key = f"lookup_version:{model._meta.label_lower}"
+        self.lock = threading.Lock()
+        self.version = None
+        self.loaded_at = 0
+        self.objects = []
+        self.by_slug = {}
+
+    def __deepcopy__(self, memo):
+        # Поля сериализаторов копируются вместе с аргументами,
+        # кеш должен остаться общим.
+        return self
+
+    def load(self):
+        version = cache.get(self.version_key)
+        if version is None:
+            version = self.invalidate()
+        expired = time.monotonic() - self.loaded_at > settings.LOOKUP_CACHE_TTL
+        if version != self.version or expired:
+            with self.lock:
+                if version != self.version or expired:
+                    objects = list(self.model.objects.order_by("pk"))
+                    self.by_slug = {obj.slug: obj for obj in objects}
+                    self.objects = objects
+                    self.version = version
+                    self.loaded_at = time.monotonic()
+        return self
+
+    def all(self):
+        return self.load().objects
+
+    def get(self, slug):
+        obj = self.load().by_slug.get(slug)
+        if obj is None:
+            # Объект мог появиться в другом процессе: ищем в БД, а при
+            # находке таблица перечитывается при следующем обращении.
+            obj = self.model.objects.filter(slug=slug).first()
+            if obj is not None:
+                self.loaded_at = 0
+        return obj
+
+    def invalidate(self):
+        version = uuid.uuid4().hex
+        cache.set(self.version_key, version, timeout=None)
+        return version
+
+
+categories = LookupCache(Category)
+genres = LookupCache(Genre)
+
+
+class TitleDetailCache:
+    """
+    Кеш ответов GET /titles/{titles_id}/ в кеше Django.
+
+    Ключ содержит id произведения и общую версию: изменение одного
+    произведения или его отзывов удаляет его ключ, изменение жанра или
+    категории (затрагивает много произведений) меняет версию. Счетчики
+    попаданий и промахов ведутся в памяти процесса.
+
+    Сброс виден всем процессам только при общем кеше (CACHE_BACKEND);
+    с кешем в памяти процесса другие процессы отдают старый ответ
+    до TITLE_CACHE_TIMEOUT секунд.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def version(self):
+        version = cache.get(TITLE_DETAIL_VERSION_KEY)
+        if version is None:
+            version = self.invalidate_all()
+        return version
+
+    def key(self, title_id):
+        return f"title_detail:{self.version()}:{title_id}"
+
+    def get(self, title_id):
+        data = cache.get(self.key(title_id))
+        with self.lock:
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return data
+
+    def set(self, title_id, data):
+        cache.set(
+            self.key(title_id), data, timeout=settings.TITLE_CACHE_TIMEOUT
+        )
+
+    def invalidate(self, *title_ids):
+        cache.delete_many([self.key(title_id) for title_id in title_ids])
+
+    def invalidate_all(self):
+        version = uuid.uuid4().hex
+        cache.set(TITLE_DETAIL_VERSION_KEY, version, timeout=None)
+        return version
+
+    def stats(self):
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+title_cache = TitleDetailCache()
+
+
+def invalidate_caches():
+    """
+    Сброс всех кешей после записи в БД в обход ORM (импорт, генерация).
+    """
+
+    title_cache.invalidate_all()
+    categories.invalidate()
+    genres.invalidate()
+    bump_versions(EPOCH)
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+def title_changed(instance, **kwargs):
+    title_cache.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def review_changed(instance, **kwargs):
+    # Отзыв меняет рейтинг произведения.
+    title_cache.invalidate(instance.title_id)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genre_changed(instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        title_cache.invalidate(instance.pk)
+    elif pk_set:
+        title_cache.invalidate(*pk_set)
+    else:
+        title_cache.invalidate_all()
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def genre_or_category_changed(sender, **kwargs):
+    title_cache.invalidate_all()
+    if sender is Category:
+        categories.invalidate()
+    else:
+        genres.invalidate()
@@ -0,0 +1,184 @@
+import functools
+import hashlib
+import time
+import uuid
+from datetime import datetime, timezone
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_save,
+)
+from django.dispatch import receiver
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from reviews.models import Category, Comment, Genre, Review, Title, User
+
+# Версия всех данных: меняется, когда изменение затрагивает слишком
+# много ответов, чтобы менять версию каждого.
+EPOCH = "all"
+
+
+def shared_cache():
+    """
+    Версии меняет только процесс, выполнивший запись. В кеше памяти
+    процесса остальные процессы об этом не узнают и отвечали бы 304
+    на измененные данные, поэтому условные запросы включаются только
+    с общим для всех процессов кешем (memcached, БД, файлы).
+    """
+
+    return not isinstance(caches["default"], (LocMemCache, DummyCache))
+
+
+def get_versions(scopes):
+    """
+    Версии областей данных из кеша Django: пары (метка, время
+    изменения). Для отсутствующих в кеше создаются новые версии —
+    ответ с ними гарантированно не совпадет с сохраненным у клиента.
+    """
+
+    keys = [f"data_version:{scope}" for scope in scopes]
+    versions = cache.get_many(keys)
+    missing = {
+        key: (uuid.uuid4().hex, time.time())
+        for key in keys
+        if key not in versions
+    }
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def bump_versions(*scopes):
+    now = time.time()
+    cache.set_many(
+        {
+            f"data_version:{scope}": (uuid.uuid4().hex, now)
+            for scope in scopes
+        },
+        timeout=None,
+    )
+
+
+def conditional_get(*scopes):
+    """
+    Декоратор метода ViewSet: ETag и Last-Modified по версиям областей
+    данных, без выборки и сериализации ответа; при совпадении
+    If-None-Match или If-Modified-Since — ответ 304.
+
+    Области задаются шаблонами, в которые подставляются параметры
+    адреса, например "reviews:{title_id}". ETag зависит также от адреса
+    с параметрами запроса и от заголовка Accept.
+
+    Без общего кеша (см. shared_cache) метод вызывается как есть.
+    """
+
+    def scope_versions(request, **kwargs):
+        # "05" и "5" — один и тот же объект.
+        kwargs = {
+            name: int(value) if str(value).isdigit() else value
+            for name, value in kwargs.items()
+        }
+        return get_versions(
+            [EPOCH] + [scope.format(**kwargs) for scope in scopes]
+        )
+
+    def etag(request, *args, **kwargs):
+        tokens = ":".join(
+            token for token, _ in scope_versions(request, **kwargs)
+        )
+        value = (
+            f"{tokens}:{request.get_full_path()}:"
+            f"{request.META.get('HTTP_ACCEPT', '')}"
+        )
+        return hashlib.md5(value.encode()).hexdigest()
+
+    def last_modified(request, *args, **kwargs):
+        changed = max(
+            changed for _, changed in scope_versions(request, **kwargs)
+        )
+        return datetime.fromtimestamp(changed, tz=timezone.utc)
+
+    def decorator(view_method):
+        conditional = method_decorator(
+            condition(etag_func=etag, last_modified_func=last_modified)
+        )(view_method)
+
+        @functools.wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            if not shared_cache():
+                return view_method(self, request, *args, **kwargs)
+            return conditional(self, request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+def title_changed(instance, **kwargs):
+    bump_versions(
+        "titles", f"title:{instance.pk}", f"reviews:{instance.pk}"
+    )
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def review_changed(instance, **kwargs):
+    bump_versions(
+        "titles",
+        f"title:{instance.title_id}",
+        f"reviews:{instance.title_id}",
+        f"comments:{instance.pk}",
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(instance, **kwargs):
+    bump_versions(f"comments:{instance.review_id}")
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genre_changed(instance, action, reverse, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        bump_versions(EPOCH)
+    else:
+        bump_versions("titles", f"title:{instance.pk}")
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def lookup_changed(**kwargs):
+    bump_versions(EPOCH)
+
+
+@receiver(pre_save, sender=User)
+def user_saving(instance, update_fields, **kwargs):
+    # Из полей пользователя в ответы попадает только имя автора
+    # отзывов и комментариев; новый пользователь в них еще не
+    # встречается. Удаление пользователя удаляет его отзывы
+    # и комментарии, их сигналы меняют свои версии.
+    instance._username_changed = (
+        instance.pk is not None
+        and (update_fields is None or "username" in update_fields)
+        and not User.objects.filter(
+            pk=instance.pk, username=instance.username
+        ).exists()
+    )
+
+
+@receiver(post_save, sender=User)
+def user_changed(instance, **kwargs):
+    if instance._username_changed:
+        bump_versions(EPOCH)
@@ -0,0 +1,195 @@
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.response import Response
+from reviews.models import Category, Genre, Title
+
+from .cache import categories, genres
+
+# Форматирование даты и времени как в полях ModelSerializer.
+pub_date_field = serializers.DateTimeField()
+
+
+class FastReadMixin:
+    """
+    Быстрое чтение для list и retrieve: ответ собирается из словарей
+    values() через fast_serializer_class без создания моделей и полей
+    сериализатора; схема JSON та же, что у serializer_class.
+
+    Если fast_serializer_class не задан, используется serializer_class.
+    Объектные права на чтение во ViewSet, где включено быстрое чтение,
+    не ограничены, поэтому check_object_permissions не вызывается.
+    """
+
+    fast_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        if self.fast_serializer_class is None:
+            return super().list(request, *args, **kwargs)
+        fast_serializer = self.fast_serializer_class()
+        queryset = fast_serializer.project(
+            self.filter_queryset(self.get_queryset())
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(
+                fast_serializer.serialize(page)
+            )
+        return Response(fast_serializer.serialize(queryset))
+
+    def retrieve(self, request, *args, **kwargs):
+        if self.fast_serializer_class is None:
+            return super().retrieve(request, *args, **kwargs)
+        fast_serializer = self.fast_serializer_class()
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = fast_serializer.project(
+            self.filter_queryset(self.get_queryset()).filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        )
+        data = fast_serializer.serialize(queryset[:1])
+        if not data:
+            # Ответ 404 с тем же текстом, что и без быстрого чтения.
+            self.get_object()
+        return Response(data[0])
+
+
+class FastSerializer:
+    """
+    Сериализатор только для чтения: project() выбирает из queryset
+    нужные колонки, serialize() превращает строки в словари ответа.
+
+    Подкласс задает fields — поля ответа по порядку: имя колонки
+    values() или пара (колонка, преобразование), где преобразование —
+    функция от значения колонки или имя метода сериализатора.
+    """
+
+    fields = {}
+
+    def __init__(self):
+        if not self.fields:
+            raise ImproperlyConfigured(
+                f"{type(self).__name__}: не задан словарь fields"
+            )
+        self.sources = []
+        for name, source in self.fields.items():
+            column, convert = (
+                (source, None) if isinstance(source, str) else source
+            )
+            if isinstance(convert, str):
+                convert = getattr(self, convert)
+            self.sources.append((name, column, convert))
+
+    def project(self, queryset):
+        columns = dict.fromkeys(column for _, column, _ in self.sources)
+        return queryset.values(*columns)
+
+    def serialize(self, rows):
+        return [self.to_representation(row) for row in rows]
+
+    def to_representation(self, row):
+        return {
+            name: row[column] if convert is None else convert(row[column])
+            for name, column, convert in self.sources
+        }
+
+
+def rating_to_int(rating):
+    return int(rating) if rating is not None else None
+
+
+class TitleFastSerializer(FastSerializer):
+    """
+    Схема TitleUserSerializer. Категория и жанры берутся из кеша
+    процесса, связи с жанрами — одним запросом на страницу.
+    """
+
+    fields = {
+        "id": "id",
+        "category": ("category_id", "get_category"),
+        "genre": ("id", "get_genre"),
+        "rating": ("rating", rating_to_int),
+        "name": "name",
+        "year": "year",
+        "description": "description",
+    }
+
+    def serialize(self, rows):
+        rows = list(rows)
+        self.title_genres = {row["id"]: [] for row in rows}
+        links = (
+            Title.genre.through.objects.filter(
+                title_id__in=self.title_genres
+            )
+            .order_by("genre_id")
+            .values_list("title_id", "genre_id")
+        )
+        self.genres = {genre.pk: genre for genre in genres.all()}
+        self.categories = {
+            category.pk: category for category in categories.all()
+        }
+        for title_id, genre_id in links:
+            self.title_genres[title_id].append(genre_id)
+        # Записи, созданные другим процессом, в кеше процесса может еще
+        # не быть — они загружаются из БД.
+        missing = {
+            genre_id
+            for genre_ids in self.title_genres.values()
+            for genre_id in genre_ids
+            if genre_id not in self.genres
+        }
+        if missing:
+            self.genres.update(Genre.objects.in_bulk(missing))
+        missing = {
+            row["category_id"]
+            for row in rows
+            if row["category_id"] is not None
+            and row["category_id"] not in self.categories
+        }
+        if missing:
+            self.categories.update(Category.objects.in_bulk(missing))
+        return super().serialize(rows)
+
+    def get_category(self, category_id):
+        category = self.categories.get(category_id)
+        if category is None:
+            return None
+        return {"name": category.name, "slug": category.slug}
+
+    def get_genre(self, title_id):
+        genre_objects = [
+            self.genres[genre_id]
+            for genre_id in self.title_genres[title_id]
+            if genre_id in self.genres
+        ]
+        return [
+            {"name": genre.name, "slug": genre.slug} for genre in genre_objects
+        ]
+
+
+class ReviewFastSerializer(FastSerializer):
+    """
+    Схема ReviewSerializer.
+    """
+
+    fields = {
+        "id": "id",
+        "title": "title__name",
+        "author": "author__username",
+        "text": "text",
+        "score": "score",
+        "pub_date": ("pub_date", pub_date_field.to_representation),
+    }
+
+
+class CommentFastSerializer(FastSerializer):
+    """
+    Схема CommentSerializer.
+    """
+
+    fields = {
+        "id": "id",
+        "review": "review__text",
+        "author": "author__username",
+        "text": "text",
+        "pub_date": ("pub_date", pub_date_field.to_representation),
+    }
@@ -1,18 +1,101 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
 from django_filters import rest_framework as filters
 from reviews.models import Title
 
+from .cache import categories
+from .genre_index import filter_by_genres
+
+# Выражение должно совпадать с индексом из миграции 0005_title_search.
+TITLE_SEARCH_VECTOR = (
+    "to_tsvector('simple', coalesce(reviews_title.name, '') || ' ' "
+    "|| coalesce(reviews_title.description, ''))"
+)
+
+
+def search_titles(queryset, query):
+    """
+    Полнотекстовый поиск по названию и описанию с сортировкой
+    по релевантности.
+
+    В SQLite используется таблица FTS5 reviews_title_fts (ранжирование
+    bm25), в PostgreSQL — tsvector с GIN-индексом (ts_rank). На других
+    БД поиск выполняется через icontains без ранжирования.
+    """
+
+    words = re.findall(r"\w+", query)
+    if not words:
+        return queryset.none()
+    if connection.vendor == "sqlite":
+        # Каждое слово — отдельный токен с поиском по префиксу,
+        # спецсимволы синтаксиса FTS5 в запрос не попадают.
+        match = " ".join(f'"{word}"*' for word in words)
+        return queryset.extra(
+            tables=["reviews_title_fts"],
+            where=[
+                "reviews_title_fts.rowid = reviews_title.id",
+                "reviews_title_fts MATCH %s",
+            ],
+            params=[match],
+            select={"search_rank": "bm25(reviews_title_fts)"},
+            order_by=["search_rank", "id"],
+        )
+    if connection.vendor == "postgresql":
+        ts_query = "plainto_tsquery('simple', %s)"
+        return queryset.extra(
+            where=[f"{TITLE_SEARCH_VECTOR} @@ {ts_query}"],
+            params=[" ".join(words)],
+            select={
+                "search_rank": f"ts_rank({TITLE_SEARCH_VECTOR}, {ts_query})"
+            },
+            select_params=[" ".join(words)],
+            order_by=["-search_rank", "id"],
+        )
+    for word in words:
+        queryset = queryset.filter(
+            Q(name__icontains=word) | Q(description__icontains=word)
+        )
+    return queryset
+
 
 class TitleFilter(filters.FilterSet):
     """
     Фильтр для произведений: данные фильтруются по полям slug категории,
-    slug жанра, по названию и по году.
+    slug жанра, по названию и по году. Параметр search — полнотекстовый
+    поиск по названию и описанию с сортировкой по релевантности.
+
+    В genre можно передать несколько slug через запятую — произведения
+    хотя бы с одним из жанров, в genre_all — произведения со всеми
+    жанрами. Жанры проверяются по битовым картам из genre_index (при
+    общем кеше), id категории по slug берется из кеша процесса.
     """
 
-    category = filters.CharFilter(field_name="category__slug")
-    genre = filters.CharFilter(field_name="genre__slug")
+    category = filters.CharFilter(method="filter_category")
+    genre = filters.CharFilter(method="filter_genre")
+    genre_all = filters.CharFilter(method="filter_genre")
     name = filters.CharFilter(field_name="name", lookup_expr="icontains")
     year = filters.NumberFilter(field_name="year")
+    search = filters.CharFilter(method="filter_search")
 
     class Meta:
         model = Title
-        fields = ("category", "genre", "year", "name")
+        fields = ("category", "genre", "genre_all", "year", "name", "search")
+
+    def filter_category(self, queryset, name, value):
+        category = categories.get(value)
+        if category is None:
+            return queryset.none()
+        return queryset.filter(category_id=category.pk)
+
+    def filter_genre(self, queryset, name, value):
+        slugs = [slug.strip() for slug in value.split(",") if slug.strip()]
+        if not slugs:
+            return queryset
+        return filter_by_genres(
+            queryset, slugs, match_all=name == "genre_all"
+        )
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
@@ -0,0 +1,173 @@
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from reviews.models import Genre, Title
+
+from .conditional import shared_cache
+
+VERSION_KEY = "genre_index_version"
+
+
+def to_bitmap(title_ids):
+    """
+    Битовая карта в виде int: бит с номером id установлен для каждого id.
+    """
+
+    if not title_ids:
+        return 0
+    bits = bytearray(max(title_ids) // 8 + 1)
+    for title_id in title_ids:
+        bits[title_id >> 3] |= 1 << (title_id & 7)
+    return int.from_bytes(bits, "little")
+
+
+def from_bitmap(bitmap):
+    """
+    Список id, соответствующих установленным битам.
+    """
+
+    title_ids = []
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    for i, byte in enumerate(data):
+        while byte:
+            low_bit = byte & -byte
+            title_ids.append(i * 8 + low_bit.bit_length() - 1)
+            byte ^= low_bit
+    return title_ids
+
+
+class GenreIndex:
+    """
+    Битовые карты произведений для каждого жанра в памяти процесса.
+
+    Фильтр по нескольким жанрам сводится к побитовым И/ИЛИ без JOIN
+    через reviews_title_genre. Карты перестраиваются одним запросом при
+    смене версии в кеше Django (ее меняют сигналы об изменении жанров
+    произведений) или по истечении GENRE_INDEX_TTL секунд — на случай
+    изменений в обход сигналов. Смену версии в другом процессе видно
+    только при общем кеше, поэтому без него карты не используются
+    (см. filter_by_genres).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = None
+        self.built_at = 0
+        self.bitmaps = {}
+
+    def get_bitmaps(self):
+        version = cache.get(VERSION_KEY)
+        if version is None:
+            version = invalidate_genre_index()
+        expired = time.monotonic() - self.built_at > settings.GENRE_INDEX_TTL
+        if version != self.version or expired:
+            with self.lock:
+                if version != self.version or expired:
+                    self.rebuild(version)
+        return self.bitmaps
+
+    def rebuild(self, version):
+        title_ids = {}
+        rows = Title.genre.through.objects.values_list(
+            "genre__slug", "title_id"
+        )
+        for slug, title_id in rows.iterator():
+            title_ids.setdefault(slug, []).append(title_id)
+        self.bitmaps = {
+            slug: to_bitmap(ids) for slug, ids in title_ids.items()
+        }
+        self.version = version
+        self.built_at = time.monotonic()
+
+    def titles(self, slugs, match_all=False):
+        """
+        id произведений хотя бы с одним (match_all=False) или со всеми
+        (match_all=True) жанрами из slugs.
+        """
+
+        bitmaps = self.get_bitmaps()
+        result = None
+        for slug in slugs:
+            bitmap = bitmaps.get(slug, 0)
+            if result is None:
+                result = bitmap
+            elif match_all:
+                result &= bitmap
+            else:
+                result |= bitmap
+        return from_bitmap(result or 0)
+
+
+genre_index = GenreIndex()
+
+
+def invalidate_genre_index():
+    version = uuid.uuid4().hex
+    cache.set(VERSION_KEY, version, timeout=None)
+    return version
+
+
+def filter_by_ids(queryset, ids):
+    """
+    Фильтр по списку id одним параметром запроса, без ограничения
+    SQLite на количество параметров.
+    """
+
+    if connection.vendor == "sqlite":
+        return queryset.extra(
+            where=["reviews_title.id IN (SELECT value FROM json_each(%s))"],
+            params=["[" + ",".join(map(str, ids)) + "]"],
+        )
+    if connection.vendor == "postgresql":
+        return queryset.extra(
+            where=["reviews_title.id = ANY(%s)"], params=[ids]
+        )
+    return queryset.filter(pk__in=ids)
+
+
+def filter_by_genres(queryset, slugs, match_all=False):
+    """
+    Произведения хотя бы с одним (match_all=False) или со всеми
+    (match_all=True) жанрами из slugs.
+
+    С общим кешем — по битовым картам genre_index. С кешем в памяти
+    процесса карты могли устареть после записи в другом процессе,
+    поэтому связи с жанрами проверяются в БД подзапросом.
+    """
+
+    if shared_cache():
+        return filter_by_ids(
+            queryset, genre_index.titles(slugs, match_all=match_all)
+        )
+    links = Title.genre.through.objects.values("title_id")
+    if not match_all:
+        return queryset.filter(pk__in=links.filter(genre__slug__in=slugs))
+    for slug in slugs:
+        queryset = queryset.filter(pk__in=links.filter(genre__slug=slug))
+    return queryset
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def genre_title_changed(action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_genre_index()
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Title)
+def genre_or_title_changed(**kwargs):
+    invalidate_genre_index()
+
+
+@receiver(post_save, sender=Title)
+def title_created(created, **kwargs):
+    # id удаленного в обход ORM произведения может достаться новому.
+    if created:
+        invalidate_genre_index()
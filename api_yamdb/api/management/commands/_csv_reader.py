@@ -0,0 +1,81 @@
+"""
+Чтение csv-файлов для команды import_data.
+
+Модуль не зависит от Django, поэтому разбор файлов можно запускать
+в дочерних процессах при любом способе их создания (fork/spawn).
+"""
+
+import csv
+import itertools
+import traceback
+
+CHUNK = "chunk"
+DONE = "done"
+ERROR = "error"
+# Значение NULL в csv, как в COPY PostgreSQL: пустая строка — это
+# пустая строка, а не отсутствие значения.
+NULL = "\\N"
+
+
+def read_header(file):
+    """
+    Заголовок csv-файла или None для пустого файла.
+    """
+
+    with open(file, newline="", encoding="utf-8") as csvfile:
+        return next(csv.reader(csvfile, delimiter=","), None)
+
+
+def normalize_row(row, columns_count):
+    """
+    Разбор строки, целиком взятой в кавычки, и замена NULL на None.
+    """
+
+    if len(row) == 1 and columns_count > 1:
+        row = next(csv.reader([row[0]], delimiter=","))
+    return [None if value == NULL else value for value in row]
+
+
+def read_chunks(file, committed, extra_values, batch_size):
+    """
+    Пачки параметров запроса по batch_size строк.
+
+    Первые committed строк с данными пропускаются без разбора,
+    к каждой строке добавляются extra_values.
+    """
+
+    with open(file, newline="", encoding="utf-8") as csvfile:
+        csv_reader = csv.reader(csvfile, delimiter=",")
+        header = next(csv_reader, None)
+        if header is None:
+            return
+        columns_count = len(header)
+        rows = itertools.islice(
+            (row for row in csv_reader if row), committed, None
+        )
+        while True:
+            batch = [
+                normalize_row(row, columns_count) + extra_values
+                for row in itertools.islice(rows, batch_size)
+            ]
+            if not batch:
+                return
+            yield batch
+
+
+def parse_worker(queue, file_name, file, committed, extra_values, batch_size):
+    """
+    Разбор файла в отдельном процессе.
+
+    Пачки строк передаются через ограниченную очередь единственному
+    процессу, который пишет в БД, поэтому в памяти одновременно
+    находится не больше maxsize пачек.
+    """
+
+    try:
+        for batch in read_chunks(file, committed, extra_values, batch_size):
+            queue.put((CHUNK, file_name, batch))
+    except Exception:
+        queue.put((ERROR, file_name, traceback.format_exc()))
+    else:
+        queue.put((DONE, file_name, None))
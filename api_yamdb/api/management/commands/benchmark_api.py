@@ -0,0 +1,352 @@
+import io
+import json
+import os
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test.runner import DiscoverRunner
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from reviews.models import Category, Comment, Genre, Review, Title, User
+
+from ...conditional import shared_cache
+from ...genre_index import genre_index
+
+BASELINE_FILE = os.path.join(settings.BASE_DIR, "benchmarks", "baseline.json")
+# Набор данных, на котором снят baseline: количество запросов к БД
+# зависит от заполненности страниц, поэтому размеры фиксированы.
+DATASET = {
+    "users": 100,
+    "categories": 3,
+    "genres": 15,
+    "titles": 100,
+    "reviews": 2000,
+    "comments": 2000,
+    "seed": 42,
+}
+BENCH_CODE = "0000"
+
+
+@contextmanager
+def test_database(current_db=False):
+    """
+    Временная тестовая БД (или текущая при current_db) для замеров.
+    """
+
+    if current_db:
+        yield
+        return
+    runner = DiscoverRunner(verbosity=0, interactive=False)
+    runner.setup_test_environment()
+    old_config = runner.setup_databases()
+    try:
+        yield
+    finally:
+        runner.teardown_databases(old_config)
+        runner.teardown_test_environment()
+
+
+def percentile(values, percent):
+    """
+    Процентиль по методу ближайшего ранга.
+    """
+
+    values = sorted(values)
+    rank = max(int(round(percent / 100 * len(values))) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+
+class Command(BaseCommand):
+    help = "Benchmark API endpoints: latency and SQL query counts"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=30,
+            help="Количество замеров на каждый адрес",
+        )
+        parser.add_argument("--warmup", type=int, default=3)
+        parser.add_argument("--baseline", default=BASELINE_FILE)
+        parser.add_argument(
+            "--update-baseline",
+            nargs="*",
+            metavar="ENDPOINT",
+            help=(
+                "Обновить в baseline указанные адреса; без имен — новые "
+                "адреса и адреса с изменившимся количеством запросов к БД"
+            ),
+        )
+        parser.add_argument(
+            "--latency-tolerance",
+            type=float,
+            default=0.5,
+            help="Допустимый рост p95 относительно baseline (0.5 — 50%%)",
+        )
+        parser.add_argument(
+            "--skip-latency",
+            action="store_true",
+            help="Сравнивать с baseline только количество запросов к БД",
+        )
+        parser.add_argument(
+            "--current-db",
+            action="store_true",
+            help="Не создавать тестовую БД, генерировать данные в текущей",
+        )
+
+    def handle(self, *args, **options):
+        with test_database(options["current_db"]):
+            results = self.run(options)
+        self.print_results(results)
+        if options["update_baseline"] is not None:
+            self.update_baseline(results, options)
+            return
+        self.compare(results, options)
+
+    def load_baseline(self, options):
+        if not os.path.exists(options["baseline"]):
+            return None
+        with open(options["baseline"], encoding="utf-8") as file:
+            return json.load(file)
+
+    def update_baseline(self, results, options):
+        """
+        Baseline меняется точечно: время ответа колеблется от запуска к
+        запуску, и перезапись всего файла скрывала бы, какие адреса
+        изменились на самом деле.
+        """
+
+        names = options["update_baseline"]
+        unknown = set(names) - set(results)
+        if unknown:
+            raise CommandError(f"Неизвестные адреса: {sorted(unknown)}")
+        baseline = self.load_baseline(options) or {}
+        updated = [
+            name
+            for name, result in results.items()
+            if name in names
+            or name not in baseline
+            or (not names and result["queries"] != baseline[name]["queries"])
+        ]
+        if not updated:
+            self.stdout.write("Baseline не изменился")
+            return
+        for name in updated:
+            baseline[name] = results[name]
+        os.makedirs(os.path.dirname(options["baseline"]), exist_ok=True)
+        with open(options["baseline"], "w", encoding="utf-8") as file:
+            json.dump(baseline, file, indent=2, sort_keys=True)
+            file.write("\n")
+        self.stdout.write(
+            self.style.SUCCESS(f"Baseline обновлен: {', '.join(updated)}")
+        )
+
+    def run(self, options):
+        call_command("generate_data", stdout=io.StringIO(), **DATASET)
+        # Битовые карты жанров (при общем кеше) строятся один раз на
+        # процесс, в замеры попадает только фильтрация.
+        if shared_cache():
+            genre_index.get_bitmaps()
+        endpoints = self.endpoints()
+        results = {}
+        for name, method, url, data, client in endpoints:
+            for i in range(options["warmup"]):
+                self.request(client, method, url, data, f"w{i}")
+            timings = []
+            queries = 0
+            for i in range(options["requests"]):
+                with CaptureQueriesContext(connection) as context:
+                    started = time.perf_counter()
+                    response = self.request(client, method, url, data, i)
+                    timings.append((time.perf_counter() - started) * 1000)
+                queries = max(queries, len(context.captured_queries))
+                if response.status_code >= 400:
+                    raise CommandError(
+                        f"{name}: {method} {url} — {response.status_code}"
+                    )
+            results[name] = {
+                "queries": queries,
+                "p50_ms": round(percentile(timings, 50), 3),
+                "p95_ms": round(percentile(timings, 95), 3),
+            }
+        return results
+
+    def request(self, client, method, url, data, suffix):
+        if data is None:
+            return getattr(client, method)(url)
+        return getattr(client, method)(url, data=data(suffix))
+
+    def endpoints(self):
+        """
+        Адреса из api/urls.py с объектами из сгенерированных данных.
+        """
+
+        admin = User.objects.create_user(
+            username="benchadmin",
+            email="benchadmin@yamdb.fake",
+            role="admin",
+            confirmation_code=BENCH_CODE,
+        )
+        anonymous = APIClient()
+        admin_client = APIClient()
+        admin_client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(admin)}"
+        )
+        title = Title.objects.order_by("-rating_count", "pk").first()
+        genre = Genre.objects.filter(titles=title).order_by("pk").first()
+        genres = ",".join(
+            Genre.objects.order_by("pk").values_list("slug", flat=True)[:3]
+        )
+        category = Category.objects.order_by("pk").first()
+        review = (
+            Review.objects.annotate(comments_count=Count("comments"))
+            .order_by("-comments_count", "pk")
+            .first()
+        )
+        comment = Comment.objects.filter(review=review).order_by("pk").first()
+        user = User.objects.exclude(pk=admin.pk).order_by("pk").first()
+        titles = "/api/v1/titles/"
+        reviews = f"{titles}{review.title_id}/reviews/"
+        comments = f"{reviews}{review.pk}/comments/"
+        return [
+            ("titles_list", "get", titles, None, anonymous),
+            (
+                "titles_filter",
+                "get",
+                f"{titles}?genre={genre.slug}&category={category.slug}",
+                None,
+                anonymous,
+            ),
+            (
+                "titles_genres",
+                "get",
+                f"{titles}?genre={genres}&year={title.year}",
+                None,
+                anonymous,
+            ),
+            ("titles_name", "get", f"{titles}?name=1", None, anonymous),
+            (
+                "titles_search",
+                "get",
+                f"{titles}?search=произведение",
+                None,
+                anonymous,
+            ),
+            (
+                "titles_year",
+                "get",
+                f"{titles}?year={title.year}",
+                None,
+                anonymous,
+            ),
+            ("titles_cursor", "get", f"{titles}?cursor=", None, anonymous),
+            ("title_detail", "get", f"{titles}{title.pk}/", None, anonymous),
+            (
+                "reviews_list",
+                "get",
+                f"{titles}{title.pk}/reviews/",
+                None,
+                anonymous,
+            ),
+            (
+                "review_detail",
+                "get",
+                f"{reviews}{review.pk}/",
+                None,
+                anonymous,
+            ),
+            ("comments_list", "get", comments, None, anonymous),
+            (
+                "comment_detail",
+                "get",
+                f"{comments}{comment.pk}/",
+                None,
+                anonymous,
+            ),
+            (
+                "categories_list",
+                "get",
+                "/api/v1/categories/",
+                None,
+                anonymous,
+            ),
+            ("genres_list", "get", "/api/v1/genres/", None, anonymous),
+            ("users_list", "get", "/api/v1/users/", None, admin_client),
+            (
+                "user_detail",
+                "get",
+                f"/api/v1/users/{user.username}/",
+                None,
+                admin_client,
+            ),
+            ("users_me", "get", "/api/v1/users/me/", None, admin_client),
+            (
+                "auth_signup",
+                "post",
+                "/api/v1/auth/signup/",
+                lambda suffix: {
+                    "username": f"bench{suffix}",
+                    "email": f"bench{suffix}@yamdb.fake",
+                },
+                anonymous,
+            ),
+            (
+                "auth_token",
+                "post",
+                "/api/v1/auth/token/",
+                lambda suffix: {
+                    "username": admin.username,
+                    "confirmation_code": BENCH_CODE,
+                },
+                anonymous,
+            ),
+        ]
+
+    def print_results(self, results):
+        self.stdout.write(
+            f"{'endpoint':<18}{'queries':>8}{'p50, мс':>10}{'p95, мс':>10}"
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<18}{result['queries']:>8}"
+                f"{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}"
+            )
+
+    def compare(self, results, options):
+        """
+        Сравнение с baseline: рост количества запросов к БД недопустим,
+        p95 может вырасти не больше чем на latency_tolerance.
+        """
+
+        baseline = self.load_baseline(options)
+        if baseline is None:
+            raise CommandError(
+                f"Не найден baseline {options['baseline']}, "
+                "запустите команду с --update-baseline"
+            )
+        regressions = []
+        for name, result in results.items():
+            expected = baseline.get(name)
+            if expected is None:
+                self.stdout.write(f"{name}: нет в baseline")
+                continue
+            if result["queries"] > expected["queries"]:
+                regressions.append(
+                    f"{name}: запросов к БД {result['queries']}, "
+                    f"в baseline {expected['queries']}"
+                )
+            limit = expected["p95_ms"] * (1 + options["latency_tolerance"])
+            if not options["skip_latency"] and result["p95_ms"] > limit:
+                regressions.append(
+                    f"{name}: p95 {result['p95_ms']:.2f} мс, "
+                    f"допустимо {limit:.2f} мс"
+                )
+        if regressions:
+            raise CommandError("Регрессия:\n" + "\n".join(regressions))
+        self.stdout.write(self.style.SUCCESS("Регрессий не найдено!"))
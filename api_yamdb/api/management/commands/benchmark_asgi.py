@@ -0,0 +1,173 @@
+import asyncio
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from reviews.models import Review
+
+from ...asgi import ASGIHandler
+from .benchmark_api import DATASET, percentile, test_database
+
+
+def scope_for(path):
+    path, _, query = path.partition("?")
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": query.encode(),
+        "http_version": "1.1",
+        "headers": [(b"accept", b"application/json")],
+    }
+
+
+class Command(BaseCommand):
+    help = "Load test read endpoints with slow clients under WSGI and ASGI"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--clients",
+            type=int,
+            default=100,
+            help="Количество одновременных клиентов",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=5,
+            help="Количество запросов каждого клиента",
+        )
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=settings.ASGI_THREADS,
+            help="Потоков у WSGI-сервера и в пуле ASGI-приложения",
+        )
+        parser.add_argument(
+            "--client-delay",
+            type=float,
+            default=0.05,
+            help="Время, за которое медленный клиент принимает ответ, сек",
+        )
+        parser.add_argument(
+            "--current-db",
+            action="store_true",
+            help="Не создавать тестовую БД, генерировать данные в текущей",
+        )
+
+    def handle(self, *args, **options):
+        with test_database(options["current_db"]):
+            call_command("generate_data", stdout=io.StringIO(), **DATASET)
+            paths = self.paths()
+            results = {
+                server: asyncio.run(self.load(server, paths, options))
+                for server in ("wsgi", "asgi")
+            }
+        self.stdout.write(
+            f"{'server':<8}{'requests':>9}{'rps':>9}"
+            f"{'p50, мс':>10}{'p95, мс':>10}"
+        )
+        for server, (timings, elapsed) in results.items():
+            self.stdout.write(
+                f"{server:<8}{len(timings):>9}{len(timings) / elapsed:>9.1f}"
+                f"{percentile(timings, 50):>10.1f}"
+                f"{percentile(timings, 95):>10.1f}"
+            )
+
+    async def load(self, server, paths, options):
+        """
+        Клиенты отправляют запросы один за другим; время ответа
+        включает ожидание свободного потока.
+        """
+
+        with ThreadPoolExecutor(max_workers=options["threads"]) as pool:
+            request = getattr(self, f"{server}_request")(pool, options)
+
+            async def client(number):
+                timings = []
+                for i in range(options["requests"]):
+                    scope = scope_for(paths[(number + i) % len(paths)])
+                    started = time.perf_counter()
+                    status = await request(scope)
+                    timings.append((time.perf_counter() - started) * 1000)
+                    if status != 200:
+                        raise CommandError(f"GET {scope['path']} — {status}")
+                return timings
+
+            started = time.perf_counter()
+            results = await asyncio.gather(
+                *(client(number) for number in range(options["clients"]))
+            )
+            elapsed = time.perf_counter() - started
+        return [timing for timings in results for timing in timings], elapsed
+
+    def wsgi_request(self, pool, options):
+        """
+        Потоковый WSGI-сервер: поток занят, пока клиент принимает ответ.
+        """
+
+        handler = WSGIHandler()
+        build_environ = ASGIHandler(handler).build_environ
+
+        def respond(scope):
+            statuses = []
+            response = handler(
+                build_environ(scope, io.BytesIO()),
+                lambda status, headers: statuses.append(status),
+            )
+            try:
+                b"".join(response)
+            finally:
+                response.close()
+            time.sleep(options["client_delay"])
+            return int(statuses[0].split(" ", 1)[0])
+
+        async def request(scope):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(pool, respond, scope)
+
+        return request
+
+    def asgi_request(self, pool, options):
+        """
+        ASGIHandler: медленному клиенту ответ отправляется в цикле
+        событий, потоки пула заняты только представлениями.
+        """
+
+        application = ASGIHandler(WSGIHandler(), executor=pool)
+
+        async def receive():
+            return {"type": "http.request", "body": b""}
+
+        async def request(scope):
+            statuses = []
+
+            async def send(message):
+                if message["type"] == "http.response.start":
+                    statuses.append(message["status"])
+                else:
+                    await asyncio.sleep(options["client_delay"])
+
+            await application(scope, receive, send)
+            return statuses[0]
+
+        return request
+
+    def paths(self):
+        """
+        Адреса на чтение произведений, отзывов и комментариев.
+        """
+
+        review = Review.objects.order_by("pk").first()
+        titles = "/api/v1/titles/"
+        reviews = f"{titles}{review.title_id}/reviews/"
+        return [
+            titles,
+            f"{titles}{review.title_id}/",
+            reviews,
+            f"{reviews}{review.pk}/comments/",
+        ]
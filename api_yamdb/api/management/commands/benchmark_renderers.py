@@ -0,0 +1,87 @@
+import io
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from reviews.models import Review, Title
+
+from ...renderers import ORJSONRenderer, orjson
+from ...serializers import ReviewSerializer, TitleUserSerializer
+from .benchmark_api import DATASET, test_database
+
+
+class Command(BaseCommand):
+    help = "Benchmark JSON renderers on title and review pages"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=200,
+            help="Количество отрисовок каждой страницы",
+        )
+        parser.add_argument("--page-size", type=int, default=100)
+        parser.add_argument(
+            "--current-db",
+            action="store_true",
+            help="Не создавать тестовую БД, генерировать данные в текущей",
+        )
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write("orjson не установлен, сравнивать не с чем")
+        with test_database(options["current_db"]):
+            call_command("generate_data", stdout=io.StringIO(), **DATASET)
+            payloads = self.payloads(options["page_size"])
+        renderers = (JSONRenderer(), ORJSONRenderer())
+        self.stdout.write(
+            f"{'payload':<10}{'KiB':>8}{'json, мс':>11}"
+            f"{'orjson, мс':>12}{'x':>7}"
+        )
+        for name, payload in payloads.items():
+            rendered = [renderer.render(payload) for renderer in renderers]
+            if rendered[0] != rendered[1]:
+                raise CommandError(f"{name}: ответы рендереров различаются")
+            timings = [
+                self.measure(renderer, payload, options["repeat"])
+                for renderer in renderers
+            ]
+            self.stdout.write(
+                f"{name:<10}{len(rendered[0]) / 1024:>8.1f}"
+                f"{timings[0]:>11.3f}{timings[1]:>12.3f}"
+                f"{timings[0] / timings[1]:>7.1f}"
+            )
+
+    def payloads(self, page_size):
+        """
+        Страницы в формате ответа API, сериализованные заранее:
+        замеряется только отрисовка JSON.
+        """
+
+        titles = Title.objects.select_related("category").prefetch_related(
+            "genre"
+        )[:page_size]
+        reviews = Review.objects.select_related("title", "author")[:page_size]
+        return {
+            name: {
+                "count": len(data),
+                "next": None,
+                "previous": None,
+                "results": data,
+            }
+            for name, data in (
+                ("titles", TitleUserSerializer(titles, many=True).data),
+                ("reviews", ReviewSerializer(reviews, many=True).data),
+            )
+        }
+
+    def measure(self, renderer, payload, repeat):
+        """
+        Среднее время одной отрисовки, мс.
+        """
+
+        started = time.perf_counter()
+        for _ in range(repeat):
+            renderer.render(payload)
+        return (time.perf_counter() - started) * 1000 / repeat
@@ -0,0 +1,159 @@
+import io
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from ...sqlite import apply_pragmas
+from .benchmark_api import DATASET, percentile, test_database
+
+# Страница отзывов произведения, как в GET /titles/{title_id}/reviews/.
+READ_SQL = """
+    SELECT review.id, review.text, review.score, review.pub_date,
+           user.username
+    FROM reviews_review review
+    JOIN reviews_user user ON user.id = review.author_id
+    WHERE review.title_id = ?
+    ORDER BY review.pub_date DESC
+    LIMIT 10
+"""
+# Новый комментарий, как в POST .../comments/.
+WRITE_SQL = """
+    INSERT INTO reviews_comment (text, pub_date, author_id, review_id)
+    VALUES (?, ?, ?, ?)
+"""
+# Умолчания SQLite, с которыми работал проект до настройки PRAGMA.
+DEFAULT_PRAGMAS = {"journal_mode": "delete", "synchronous": "full"}
+
+
+class Command(BaseCommand):
+    help = "Benchmark concurrent SQLite reads and writes, default vs tuned"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=3.0,
+            help="Длительность каждого замера, сек",
+        )
+        parser.add_argument("--readers", type=int, default=4)
+        parser.add_argument("--writers", type=int, default=2)
+        parser.add_argument(
+            "--current-db",
+            action="store_true",
+            help="Не создавать тестовую БД, генерировать данные в текущей",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("Замер имеет смысл только для SQLite")
+        with tempfile.TemporaryDirectory() as directory:
+            template = os.path.join(directory, "template.sqlite3")
+            with test_database(options["current_db"]):
+                call_command("generate_data", stdout=io.StringIO(), **DATASET)
+                connection.ensure_connection()
+                target = sqlite3.connect(template)
+                connection.connection.backup(target)
+                target.close()
+            results = {}
+            for name, pragmas in (
+                ("default", DEFAULT_PRAGMAS),
+                ("tuned", settings.SQLITE_PRAGMAS),
+            ):
+                path = os.path.join(directory, f"{name}.sqlite3")
+                shutil.copy(template, path)
+                results[name] = self.run(path, pragmas, options)
+        self.stdout.write(
+            f"{'pragmas':<9}{'reads/s':>9}{'writes/s':>10}"
+            f"{'read p95, мс':>14}{'write p95, мс':>15}{'locked':>8}"
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<9}{result['reads']:>9.0f}{result['writes']:>10.0f}"
+                f"{result['read_p95']:>14.2f}{result['write_p95']:>15.2f}"
+                f"{result['locked']:>8}"
+            )
+
+    def run(self, path, pragmas, options):
+        """
+        Читатели и писатели в отдельных потоках, у каждого свое
+        соединение, как у потоков WSGI-сервера.
+        """
+
+        setup = sqlite3.connect(path)
+        apply_pragmas(setup, pragmas)
+        title_ids = [
+            row[0]
+            for row in setup.execute(
+                "SELECT DISTINCT title_id FROM reviews_review"
+            )
+        ]
+        review_ids, author_ids = zip(
+            *setup.execute("SELECT id, author_id FROM reviews_review")
+        )
+        setup.close()
+        timings = {"read": [], "write": []}
+        locked = []
+        deadline = time.perf_counter() + options["duration"]
+
+        def worker(kind):
+            # Ожидание блокировки ограничено busy_timeout из pragmas,
+            # без него — таймаутом sqlite3 по умолчанию.
+            db = sqlite3.connect(path, isolation_level=None)
+            apply_pragmas(db, pragmas)
+            timing = []
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    if kind == "read":
+                        db.execute(
+                            READ_SQL, (random.choice(title_ids),)
+                        ).fetchall()
+                    else:
+                        db.execute("BEGIN IMMEDIATE")
+                        db.execute(
+                            WRITE_SQL,
+                            (
+                                "Комментарий",
+                                timezone.now().isoformat(" "),
+                                random.choice(author_ids),
+                                random.choice(review_ids),
+                            ),
+                        )
+                        db.execute("COMMIT")
+                except sqlite3.OperationalError:
+                    if db.in_transaction:
+                        db.execute("ROLLBACK")
+                    locked.append(kind)
+                    continue
+                timing.append((time.perf_counter() - started) * 1000)
+            db.close()
+            timings[kind].extend(timing)
+
+        threads = [
+            threading.Thread(target=worker, args=("read",))
+            for _ in range(options["readers"])
+        ] + [
+            threading.Thread(target=worker, args=("write",))
+            for _ in range(options["writers"])
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return {
+            "reads": len(timings["read"]) / options["duration"],
+            "writes": len(timings["write"]) / options["duration"],
+            "read_p95": percentile(timings["read"] or [0], 95),
+            "write_p95": percentile(timings["write"] or [0], 95),
+            "locked": len(locked),
+        }
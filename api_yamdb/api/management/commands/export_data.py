@@ -0,0 +1,123 @@
+import csv
+import datetime as dt
+import json
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from reviews.models import Category, Comment, Genre, Review, Title, User
+
+from ._csv_reader import NULL
+
+# Имена файлов и столбцов совпадают с ожидаемыми командой import_data.
+EXPORT_TABLES = {
+    "users.csv": (
+        User,
+        ("id", "username", "email", "role", "bio", "first_name", "last_name"),
+    ),
+    "category.csv": (Category, ("id", "name", "slug")),
+    "genre.csv": (Genre, ("id", "name", "slug")),
+    "titles.csv": (Title, ("id", "name", "year", "category", "description")),
+    "genre_title.csv": (Title.genre.through, ("id", "title_id", "genre_id")),
+    "review.csv": (
+        Review,
+        ("id", "title_id", "text", "author", "score", "pub_date"),
+    ),
+    "comments.csv": (
+        Comment,
+        ("id", "review_id", "text", "author", "pub_date"),
+    ),
+}
+PATH_TO_EXPORT = os.path.join(settings.BASE_DIR, "export")
+CHUNK_SIZE = 2000
+FORMATS = ("csv", "ndjson")
+
+
+class Command(BaseCommand):
+    help = "Export data from DB to csv files"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            default=PATH_TO_EXPORT,
+            help="Папка для выгрузки",
+        )
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            default="csv",
+            help="Формат файлов: csv или ndjson (одна JSON-запись в строке)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=CHUNK_SIZE,
+            help="Количество строк, читаемых из БД за один раз",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        os.makedirs(path, exist_ok=True)
+        for file_name, (model, fields) in EXPORT_TABLES.items():
+            if options["format"] == "ndjson":
+                file_name = file_name.replace(".csv", ".ndjson")
+            self.export_table(
+                model,
+                fields,
+                os.path.join(path, file_name),
+                options["format"],
+                options["chunk_size"],
+            )
+        self.stdout.write(self.style.SUCCESS("Экспорт данных завершен!"))
+
+    def export_table(self, model, fields, file, file_format, chunk_size):
+        """
+        Потоковая выгрузка таблицы.
+
+        Строки читаются из БД итератором по chunk_size без кеширования
+        queryset, поэтому таблица целиком в память не загружается.
+        """
+
+        started = time.monotonic()
+        rows_count = 0
+        rows = (
+            model.objects.order_by("pk")
+            .values_list(*fields)
+            .iterator(chunk_size=chunk_size)
+        )
+        with open(file, "w", newline="", encoding="utf-8") as output:
+            if file_format == "csv":
+                writer = csv.writer(output, delimiter=",")
+                writer.writerow(fields)
+                for row in rows:
+                    writer.writerow(
+                        NULL if value is None else value
+                        for value in self.data_handler(row)
+                    )
+                    rows_count += 1
+            else:
+                for row in rows:
+                    output.write(
+                        json.dumps(
+                            dict(zip(fields, self.data_handler(row))),
+                            ensure_ascii=False,
+                        )
+                    )
+                    output.write("\n")
+                    rows_count += 1
+        elapsed = max(time.monotonic() - started, 1e-6)
+        self.stdout.write(
+            f"{os.path.basename(file)}: {rows_count} строк за {elapsed:.2f} с "
+            f"({rows_count / elapsed:.0f} строк/с)"
+        )
+
+    def data_handler(self, row):
+        """
+        Приведение значений строки к виду, который понимает import_data.
+        """
+
+        return [
+            value.isoformat() if isinstance(value, dt.datetime) else value
+            for value in row
+        ]
@@ -0,0 +1,236 @@
+import itertools
+import random
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from reviews.models import (
+    Category,
+    Comment,
+    Genre,
+    Review,
+    Title,
+    User,
+    recalculate_title_ratings,
+)
+
+from ...cache import invalidate_caches
+from ...genre_index import invalidate_genre_index
+
+BATCH_SIZE = 5000
+# Доля оценок от 1 до 10: высокие оценки ставят чаще.
+SCORE_WEIGHTS = (2, 2, 3, 4, 6, 9, 14, 20, 22, 18)
+# Чем меньше параметр, тем сильнее популярность сосредоточена
+# на небольшом числе произведений и жанров.
+POPULARITY_ALPHA = 1.5
+PERIOD_DAYS = 5 * 365
+
+
+@contextmanager
+def auto_now_add_disabled(*models):
+    """
+    Позволяет задать pub_date вручную, чтобы даты были распределены
+    по времени, а не совпадали с моментом вставки.
+    """
+
+    fields = [
+        field
+        for model in models
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now_add", False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    help = "Generate synthetic data for load tests"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--categories", type=int, default=3)
+        parser.add_argument("--genres", type=int, default=15)
+        parser.add_argument("--titles", type=int, default=1000)
+        parser.add_argument(
+            "--max-genres",
+            type=int,
+            default=3,
+            help="Максимальное количество жанров у произведения",
+        )
+        parser.add_argument("--reviews", type=int, default=10000)
+        parser.add_argument("--comments", type=int, default=20000)
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            "--seed",
+            type=int,
+            help="Начальное значение генератора для воспроизводимости",
+        )
+
+    def handle(self, *args, **options):
+        if options["reviews"] and not (options["users"] and options["titles"]):
+            raise CommandError("Для отзывов нужны пользователи и произведения")
+        if options["comments"] and not options["reviews"]:
+            raise CommandError("Для комментариев нужны отзывы")
+        self.random = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.now = timezone.now()
+
+        users = self.insert(User, self.users_rows(options["users"]))
+        categories = self.insert(
+            Category,
+            self.named_rows(Category, "category", options["categories"]),
+        )
+        genres = self.insert(
+            Genre, self.named_rows(Genre, "genre", options["genres"])
+        )
+        titles = self.insert(
+            Title, self.titles_rows(options["titles"], categories)
+        )
+        self.insert(
+            Title.genre.through,
+            self.genre_title_rows(titles, genres, options["max_genres"]),
+        )
+        with auto_now_add_disabled(Review, Comment):
+            reviews = self.insert(
+                Review, self.reviews_rows(options["reviews"], titles, users)
+            )
+            self.insert(
+                Comment,
+                self.comments_rows(options["comments"], reviews, users),
+            )
+        recalculate_title_ratings(Title.objects.filter(pk__in=titles))
+        invalidate_genre_index()
+        invalidate_caches()
+        self.stdout.write(self.style.SUCCESS("Генерация данных завершена!"))
+
+    def insert(self, model, rows):
+        """
+        Вставка объектов пачками через bulk_create.
+
+        Возвращает диапазон id созданных объектов.
+        """
+
+        first_id = self.next_id(model)
+        started = time.monotonic()
+        rows_count = 0
+        with transaction.atomic():
+            while True:
+                batch = list(itertools.islice(rows, self.batch_size))
+                if not batch:
+                    break
+                # Размер одного INSERT Django подбирает сам с учетом
+                # ограничения БД на количество параметров.
+                model.objects.bulk_create(batch)
+                rows_count += len(batch)
+        elapsed = max(time.monotonic() - started, 1e-6)
+        self.stdout.write(
+            f"{model._meta.db_table}: {rows_count} строк за {elapsed:.2f} с "
+            f"({rows_count / elapsed:.0f} строк/с)"
+        )
+        return range(first_id, first_id + rows_count)
+
+    def next_id(self, model):
+        return (model.objects.aggregate(max_id=Max("pk"))["max_id"] or 0) + 1
+
+    def popularity(self, count):
+        """
+        Веса популярности с тяжелым хвостом (распределение Парето).
+        """
+
+        return [
+            self.random.paretovariate(POPULARITY_ALPHA) for _ in range(count)
+        ]
+
+    def random_date(self):
+        return self.now - timedelta(
+            seconds=self.random.randint(0, PERIOD_DAYS * 24 * 3600)
+        )
+
+    def users_rows(self, count):
+        password = make_password(None)
+        first_id = self.next_id(User)
+        for pk in range(first_id, first_id + count):
+            yield User(
+                id=pk,
+                username=f"user{pk}",
+                email=f"user{pk}@yamdb.fake",
+                password=password,
+            )
+
+    def named_rows(self, model, prefix, count):
+        first_id = self.next_id(model)
+        for pk in range(first_id, first_id + count):
+            yield model(id=pk, name=f"{prefix} {pk}", slug=f"{prefix}-{pk}")
+
+    def titles_rows(self, count, categories):
+        first_id = self.next_id(Title)
+        for pk in range(first_id, first_id + count):
+            yield Title(
+                id=pk,
+                name=f"Произведение {pk}",
+                year=self.random.randint(1900, self.now.year),
+                category_id=(
+                    self.random.choice(categories) if categories else None
+                ),
+                description=f"Описание произведения {pk}",
+            )
+
+    def genre_title_rows(self, titles, genres, max_genres):
+        if not genres:
+            return
+        weights = list(itertools.accumulate(self.popularity(len(genres))))
+        through = Title.genre.through
+        for title_id in titles:
+            count = self.random.randint(1, min(max_genres, len(genres)))
+            genre_ids = set(
+                self.random.choices(genres, cum_weights=weights, k=count)
+            )
+            for genre_id in genre_ids:
+                yield through(title_id=title_id, genre_id=genre_id)
+
+    def reviews_rows(self, count, titles, users):
+        """
+        Отзывы распределяются по произведениям пропорционально
+        популярности; автор отзыва на произведение не повторяется.
+        """
+
+        weights = self.popularity(len(titles))
+        total_weight = sum(weights)
+        pk = self.next_id(Review)
+        scores = range(1, 11)
+        for title_id, weight in zip(titles, weights):
+            title_count = min(
+                len(users),
+                int(count * weight / total_weight + self.random.random()),
+            )
+            for author_id in self.random.sample(users, title_count):
+                yield Review(
+                    id=pk,
+                    title_id=title_id,
+                    author_id=author_id,
+                    text=f"Отзыв {pk}",
+                    score=self.random.choices(scores, SCORE_WEIGHTS)[0],
+                    pub_date=self.random_date(),
+                )
+                pk += 1
+
+    def comments_rows(self, count, reviews, users):
+        first_id = self.next_id(Comment)
+        for pk in range(first_id, first_id + count):
+            yield Comment(
+                id=pk,
+                review_id=self.random.choice(reviews),
+                author_id=self.random.choice(users),
+                text=f"Комментарий {pk}",
+                pub_date=self.random_date(),
+            )
@@ -1,10 +1,24 @@
-import csv
+import multiprocessing
 import os
-import re
+import queue as queue_module
+import time
 
 from django.conf import settings
-from django.core.management.base import BaseCommand
-from django.db import connection
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from reviews.models import ImportCheckpoint, recalculate_title_ratings
+
+from ...cache import invalidate_caches
+from ...genre_index import invalidate_genre_index
+from ._csv_reader import (
+    CHUNK,
+    DONE,
+    ERROR,
+    parse_worker,
+    read_chunks,
+    read_header,
+)
 
 TABLE_PREFIX = "reviews"
 FILES_TBLS_LIST = {
@@ -18,88 +32,304 @@ FILES_TBLS_LIST = {
 }
 PATH_TO_CSV = os.path.join(settings.BASE_DIR, "static", "data")
 FLD_TITLES_TO_CHANGE = {"category": "category_id", "author": "author_id"}
+# Значения полей, которых нет в csv: у Django нет значений по умолчанию
+# на уровне БД. Вызываемые объекты вычисляются один раз на файл.
+EXTRA_FLDS = {
+    "users.csv": {
+        "password": "0",
+        "is_superuser": False,
+        "is_staff": False,
+        "is_active": True,
+        "date_joined": timezone.now,
+    },
+    "titles.csv": {"rating_sum": 0, "rating_count": 0},
+}
+# Файлы, которые должны быть загружены раньше указанного.
+FILES_DEPENDENCIES = {
+    "titles.csv": ("category.csv",),
+    "genre_title.csv": ("titles.csv", "genre.csv"),
+    "review.csv": ("titles.csv", "users.csv"),
+    "comments.csv": ("review.csv", "users.csv"),
+}
+BATCH_SIZE = 1000
+# Как часто при ожидании пачек проверяется, живы ли процессы разбора, сек.
+WORKER_POLL_TIMEOUT = 5
 
 
 class Command(BaseCommand):
     help = "Import data from csv files to DB"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            default=PATH_TO_CSV,
+            help="Папка с csv-файлами",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help="Количество строк в одной транзакции",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Продолжить прерванный импорт с места остановки",
+        )
+        parser.add_argument(
+            "--allow-broken-links",
+            action="store_true",
+            help=(
+                "Не считать ошибкой строки, ссылающиеся на отсутствующие "
+                "записи (например, импорт без users.csv)"
+            ),
+        )
+        parser.add_argument(
+            "--jobs",
+            type=int,
+            default=min(os.cpu_count() or 1, 4),
+            help="Количество процессов для разбора csv (1 — без процессов)",
+        )
+
     def handle(self, *args, **options):
-        cursor = connection.cursor()
-        # Временно отключаем внешние ключи.
-        cursor.execute("PRAGMA foreign_keys = OFF;")
-        files_csv_list = os.listdir(PATH_TO_CSV)
-
-        for file_name in files_csv_list:
-            if file_name in FILES_TBLS_LIST.keys():
-                tbl_t = FILES_TBLS_LIST[file_name][0]
-                header_in_query = FILES_TBLS_LIST[file_name][1]
-                file = os.path.join(PATH_TO_CSV, file_name)
-                with open(file, newline="", encoding="utf-8") as csvfile:
-                    csv_reader = csv.reader(csvfile, delimiter=",")
-                    row_num = 0
-                    for row in csv_reader:
-                        if row_num == 0:
-                            sql_hdr = self.header_handler(
-                                row, header_in_query, tbl_t, file_name
-                            )
-                        else:
-                            sql_fld_values = self.data_handler(row, file_name)
-                            sql_body_final = (
-                                f"{sql_hdr} VALUES ({sql_fld_values})"
-                            )
-                            cursor.execute(sql_body_final)
-                        row_num += 1
-        # Включаем внешние ключи.
-        cursor.execute("PRAGMA foreign_keys = ON;")
+        path = os.path.abspath(options["path"])
+        file_names = [
+            file_name
+            for file_name in os.listdir(path)
+            if file_name in FILES_TBLS_LIST.keys()
+        ]
+        checkpoints = ImportCheckpoint.objects.filter(
+            file__in=[os.path.join(path, name) for name in file_names]
+        )
+        checkpoint = {}
+        if options["resume"]:
+            checkpoint = {
+                os.path.basename(file): rows
+                for file, rows in checkpoints.values_list("file", "rows")
+            }
+        else:
+            checkpoints.delete()
+        with connection.cursor() as cursor:
+            # Временно отключаем внешние ключи.
+            cursor.execute("PRAGMA foreign_keys = OFF;")
+            try:
+                for stage in import_stages(file_names):
+                    self.import_stage(cursor, path, stage, options, checkpoint)
+            finally:
+                # Включаем внешние ключи.
+                cursor.execute("PRAGMA foreign_keys = ON;")
+            violations = self.check_foreign_keys(cursor)
+        checkpoints.delete()
+        # Рейтинг произведений хранится в таблице и не обновляется
+        # при вставке отзывов в обход ORM.
+        recalculate_title_ratings()
+        invalidate_genre_index()
+        invalidate_caches()
+        if violations and not options["allow_broken_links"]:
+            # Строки уже сохранены: ошибка сообщает, что данные нужно
+            # дополнить недостающими записями.
+            raise CommandError(
+                "Импорт завершен с нарушением внешних ключей:\n"
+                + "\n".join(violations)
+            )
         self.stdout.write(self.style.SUCCESS("Импорт данных завершен!"))
 
+    def import_stage(self, cursor, path, stage, options, checkpoint):
+        """
+        Импорт группы независимых файлов.
+
+        Файлы разбираются параллельно в jobs дочерних процессах, а пачки
+        строк записываются в БД единственным (текущим) процессом: каждая
+        пачка — в своей транзакции. В той же транзакции в ImportCheckpoint
+        записывается количество сохраненных строк файла, поэтому при
+        --resume пропускаются ровно те строки, что есть в БД.
+        """
+
+        tasks = self.stage_tasks(path, stage, options, checkpoint)
+
+        def write_chunk(file_name, batch):
+            rows = checkpoint.get(file_name, 0) + len(batch)
+            with transaction.atomic():
+                cursor.executemany(tasks[file_name]["sql"], batch)
+                ImportCheckpoint.objects.update_or_create(
+                    file=os.path.join(path, file_name),
+                    defaults={"rows": rows},
+                )
+            tasks[file_name]["rows"] += len(batch)
+            checkpoint[file_name] = rows
+
+        if options["jobs"] <= 1:
+            for file_name, task in tasks.items():
+                for batch in read_chunks(*task["args"]):
+                    write_chunk(file_name, batch)
+                self.report(file_name, task)
+            return
+
+        self.parse_in_workers(tasks, options["jobs"], write_chunk)
+
+    def stage_tasks(self, path, stage, options, checkpoint):
+        """
+        Запросы и аргументы разбора для файлов группы.
+        """
+
+        tasks = {}
+        for file_name in stage:
+            file = os.path.join(path, file_name)
+            header = read_header(file)
+            if header is None:
+                continue
+            tbl_t, header_in_query = FILES_TBLS_LIST[file_name]
+            sql, extra_values = self.header_handler(
+                header, header_in_query, tbl_t, file_name
+            )
+            tasks[file_name] = {
+                "args": (
+                    file,
+                    checkpoint.get(file_name, 0),
+                    extra_values,
+                    options["batch_size"],
+                ),
+                "sql": sql,
+                "skipped": checkpoint.get(file_name, 0),
+                "rows": 0,
+                "started": time.monotonic(),
+            }
+        return tasks
+
+    def parse_in_workers(self, tasks, jobs, write_chunk):
+        """
+        Разбор файлов в не более чем jobs процессах одновременно.
+
+        Если процесс разбора завершился, не сообщив об окончании
+        (например, убит по нехватке памяти), импорт прерывается.
+        """
+
+        queue = multiprocessing.Queue(maxsize=2 * jobs)
+        pending = list(tasks)
+        workers = {}
+        try:
+            while pending or workers:
+                while pending and len(workers) < jobs:
+                    file_name = pending.pop(0)
+                    workers[file_name] = multiprocessing.Process(
+                        target=parse_worker,
+                        args=(queue, file_name, *tasks[file_name]["args"]),
+                        daemon=True,
+                    )
+                    workers[file_name].start()
+                kind, file_name, payload = self.next_message(queue, workers)
+                if kind == CHUNK:
+                    write_chunk(file_name, payload)
+                elif kind == ERROR:
+                    raise CommandError(
+                        f"Ошибка разбора {file_name}:\n{payload}"
+                    )
+                elif kind == DONE:
+                    workers.pop(file_name).join()
+                    self.report(file_name, tasks[file_name])
+        finally:
+            for worker in workers.values():
+                worker.terminate()
+                worker.join()
+
+    def next_message(self, queue, workers):
+        """
+        Очередное сообщение от процессов разбора.
+        """
+
+        while True:
+            try:
+                return queue.get(timeout=WORKER_POLL_TIMEOUT)
+            except queue_module.Empty:
+                pass
+            dead = {
+                file_name: worker.exitcode
+                for file_name, worker in workers.items()
+                if not worker.is_alive()
+            }
+            # Завершившийся процесс успевает передать в канал все свои
+            # сообщения, поэтому пустая очередь значит, что DONE не будет.
+            if dead and queue.empty():
+                raise CommandError(
+                    "Процесс разбора завершился без результата: "
+                    + ", ".join(
+                        f"{file_name} (код {exitcode})"
+                        for file_name, exitcode in dead.items()
+                    )
+                )
+
+    def report(self, file_name, task):
+        """
+        Вывод статистики импорта файла.
+        """
+
+        rows_count = task["rows"]
+        elapsed = max(time.monotonic() - task["started"], 1e-6)
+        skipped = f", пропущено {task['skipped']}" if task["skipped"] else ""
+        self.stdout.write(
+            f"{file_name}: {rows_count} строк за {elapsed:.2f} с "
+            f"({rows_count / elapsed:.0f} строк/с{skipped})"
+        )
+
+    def check_foreign_keys(self, cursor):
+        """
+        Однократная проверка внешних ключей после загрузки всех файлов.
+        Возвращает описания нарушений и выводит их в stderr.
+        """
+
+        cursor.execute("PRAGMA foreign_key_check;")
+        counts = {}
+        for table, *_ in cursor.fetchall():
+            counts[table] = counts.get(table, 0) + 1
+        violations = [
+            f"{table}: {count} строк ссылаются на отсутствующие записи"
+            for table, count in counts.items()
+        ]
+        for violation in violations:
+            self.stderr.write(self.style.WARNING(violation))
+        return violations
+
     def header_handler(self, row, header_in_query, tbl_t, file_name):
         """
-        Создание заголовочной части тела запроса.
+        Создание параметризованного запроса на вставку.
         """
 
+        quote_name = connection.ops.quote_name
+        extra_values = []
         if header_in_query == 1:
             for k in FLD_TITLES_TO_CHANGE.keys():
                 if k in row:
                     cur_i = row.index(k)
                     row[cur_i] = FLD_TITLES_TO_CHANGE[k]
-            if "user" in file_name:
-                row.append("password")
-                row.append("is_superuser")
-                row.append("is_staff")
-                row.append("is_active")
-                row.append("date_joined")
-            sql_hdr = f"INSERT INTO `{tbl_t}` ({', '.join(row)})"
+            for column, value in EXTRA_FLDS.get(file_name, {}).items():
+                row.append(column)
+                extra_values.append(value() if callable(value) else value)
+            columns = ", ".join(quote_name(column) for column in row)
+            sql_hdr = f"INSERT INTO {quote_name(tbl_t)} ({columns})"
         else:
-            sql_hdr = f"INSERT INTO `{tbl_t}`"
-        return sql_hdr
+            sql_hdr = f"INSERT INTO {quote_name(tbl_t)}"
+        placeholders = ", ".join(["%s"] * len(row))
+        return f"{sql_hdr} VALUES ({placeholders})", extra_values
 
-    def data_handler(self, row, file_name):
-        """
-        Создание основной части тела запроса.
-        """
 
-        vals = ""
-        if len(row) == 1:
-            # Разделитель в данных
-            if row[0][0] == '"' and row[0][-1] == '"':
-                row[0] = row[0][1:-1]
-            row = re.split(
-                """,
-                (?=(?:[^'"]|'[^']*'|"[^"]*")*$)""",
-                row[0],
-            )
-        for w in row:
-            if w.isnumeric():
-                vals += f"{w}, "
-            else:
-                w = w.replace("'", "%27")
-                vals += f"'{w}', "
-        if "user" in file_name:
-            vals += "'0', "
-            vals += "'no', "
-            vals += "'no', "
-            vals += "'yes', "
-            vals += "'2022-09-16T21:08:21.567Z', "
-        sql_fld_values = vals[0:-2]
-        return sql_fld_values
+def import_stages(file_names):
+    """
+    Разбиение файлов на группы в порядке зависимостей FILES_DEPENDENCIES.
+
+    Файлы одной группы не зависят друг от друга и загружаются параллельно.
+    Зависимости от отсутствующих файлов игнорируются.
+    """
+
+    pending = set(file_names)
+    stages = []
+    while pending:
+        stage = sorted(
+            file_name
+            for file_name in pending
+            if not pending.intersection(FILES_DEPENDENCIES.get(file_name, ()))
+        )
+        if not stage:
+            raise CommandError(f"Циклическая зависимость файлов: {pending}")
+        stages.append(stage)
+        pending.difference_update(stage)
+    return stages
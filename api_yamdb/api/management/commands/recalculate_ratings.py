@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from reviews.models import Title, recalculate_title_ratings
+
+from ...cache import title_cache
+
+
+class Command(BaseCommand):
+    help = "Recalculate stored title ratings from reviews"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "title_ids",
+            nargs="*",
+            type=int,
+            help="id произведений для пересчета (по умолчанию — все)",
+        )
+
+    def handle(self, *args, **options):
+        queryset = Title.objects.all()
+        if options["title_ids"]:
+            queryset = queryset.filter(pk__in=options["title_ids"])
+        updated = recalculate_title_ratings(queryset)
+        title_cache.invalidate_all()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Рейтинг пересчитан для {updated} произведений!"
+            )
+        )
@@ -0,0 +1,165 @@
+import time
+import uuid
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+from reviews.models import OutgoingEmail
+
+BATCH_SIZE = 100
+MAX_ATTEMPTS = 5
+# Задержка перед повторной попыткой удваивается после каждой ошибки.
+BACKOFF = 60
+# Через столько секунд письмо, взятое упавшим отправителем, снова
+# доступно для отправки.
+LEASE = 600
+
+
+class Command(BaseCommand):
+    help = "Send queued emails from the outbox in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            "--max-attempts",
+            type=int,
+            default=MAX_ATTEMPTS,
+            help="После стольких ошибок письмо больше не отправляется",
+        )
+        parser.add_argument(
+            "--backoff",
+            type=int,
+            default=BACKOFF,
+            help="Задержка перед первой повторной попыткой, секунд",
+        )
+        parser.add_argument(
+            "--lease",
+            type=int,
+            default=LEASE,
+            help=(
+                "Через сколько секунд письмо, взятое другим запуском "
+                "и не отправленное, можно взять снова"
+            ),
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Не завершаться, ждать новые письма",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Пауза между проверками пустой очереди в режиме --loop",
+        )
+
+    def handle(self, *args, **options):
+        sent = failed = 0
+        while True:
+            batch = self.claim(options)
+            if batch:
+                batch_sent, batch_failed = self.send_batch(batch, options)
+                sent += batch_sent
+                failed += batch_failed
+            if len(batch) == options["batch_size"]:
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Отправлено: {sent}, с ошибкой: {failed}")
+        )
+
+    def claim(self, options):
+        """
+        Пачка неотправленных писем, для которых подошло время попытки.
+
+        Письма помечаются меткой этого запуска одним UPDATE с условием
+        «еще не взято», поэтому параллельный запуск их уже не получит.
+        Письма, взятые больше lease секунд назад, берутся снова.
+        """
+
+        now = timezone.now()
+        available = OutgoingEmail.objects.filter(
+            Q(claimed_at__isnull=True)
+            | Q(claimed_at__lt=now - timedelta(seconds=options["lease"])),
+            sent_at__isnull=True,
+            next_attempt_at__lte=now,
+            attempts__lt=options["max_attempts"],
+        )
+        candidates = list(
+            available.order_by("next_attempt_at", "pk").values_list(
+                "pk", flat=True
+            )[: options["batch_size"]]
+        )
+        if not candidates:
+            return []
+        token = uuid.uuid4()
+        available.filter(pk__in=candidates).update(
+            claim_token=token, claimed_at=now
+        )
+        return list(
+            OutgoingEmail.objects.filter(claim_token=token).order_by(
+                "next_attempt_at", "pk"
+            )
+        )
+
+    def send_batch(self, batch, options):
+        """
+        Отправка пачки писем через одно соединение. Каждое письмо
+        отмечается отправленным сразу после отправки, поэтому сбой
+        посреди пачки не приводит к повторной отправке. Если соединение
+        открыть не удалось, повторная попытка назначается всей пачке.
+        """
+
+        sent = failed = 0
+        connection = get_connection()
+        try:
+            connection.open()
+        except Exception as error:
+            for email in batch:
+                self.reschedule(email, error, options)
+            return sent, len(batch)
+        try:
+            for email in batch:
+                message = EmailMessage(
+                    email.subject,
+                    email.body,
+                    email.from_email,
+                    [email.to_email],
+                    connection=connection,
+                )
+                try:
+                    message.send()
+                except Exception as error:
+                    self.reschedule(email, error, options)
+                    failed += 1
+                else:
+                    OutgoingEmail.objects.filter(pk=email.pk).update(
+                        sent_at=timezone.now()
+                    )
+                    sent += 1
+        finally:
+            connection.close()
+        return sent, failed
+
+    def reschedule(self, email, error, options):
+        email.attempts += 1
+        delay = options["backoff"] * 2 ** (email.attempts - 1)
+        email.next_attempt_at = timezone.now() + timedelta(seconds=delay)
+        email.last_error = str(error)
+        # Письмо освобождается для следующей попытки.
+        email.claimed_at = None
+        email.save(
+            update_fields=(
+                "attempts",
+                "next_attempt_at",
+                "last_error",
+                "claimed_at",
+            )
+        )
+        self.stderr.write(
+            f"{email.to_email}: попытка {email.attempts} — {error}"
+        )
@@ -0,0 +1,75 @@
+import json
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger("api.queries")
+
+
+class QueryStats:
+    """
+    Обертка выполнения запросов к БД: считает их количество и время.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+
+
+class QueryCountMiddleware:
+    """
+    Количество и суммарное время запросов к БД для каждого запроса.
+
+    Результат передается в заголовках X-Query-Count и Server-Timing
+    и пишется в лог api.queries одной JSON-строкой. Включается
+    настройкой QUERY_INSTRUMENTATION; если она выключена, Django
+    исключает middleware из цепочки при запуске.
+    """
+
+    def __init__(self, get_response):
+        if not settings.QUERY_INSTRUMENTATION:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = QueryStats()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            response = self.get_response(request)
+        total = time.perf_counter() - started
+
+        server_timing = (
+            f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries"'
+            f", total;dur={total * 1000:.2f}"
+        )
+        if response.has_header("Server-Timing"):
+            server_timing = f"{response['Server-Timing']}, {server_timing}"
+        response["Server-Timing"] = server_timing
+        response["X-Query-Count"] = str(stats.count)
+        logger.info(
+            json.dumps(
+                {
+                    "method": request.method,
+                    "path": request.path,
+                    "status": response.status_code,
+                    "queries": stats.count,
+                    "db_ms": round(stats.duration * 1000, 2),
+                    "total_ms": round(total * 1000, 2),
+                }
+            )
+        )
+        return response
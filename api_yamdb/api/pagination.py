@@ -0,0 +1,59 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class TitleCursorPagination(CursorPagination):
+    ordering = ("id",)
+
+
+class PubDateCursorPagination(CursorPagination):
+    ordering = ("pub_date", "id")
+
+
+class PageNumberOrCursorPagination(PageNumberPagination):
+    """
+    Постраничная пагинация с опциональным режимом курсора.
+
+    По умолчанию работает как PageNumberPagination (COUNT + OFFSET).
+    Если в запросе передан параметр ``cursor`` (в том числе пустой —
+    для первой страницы), выдача строится через cursor_pagination_class:
+    поиск по индексу вместо OFFSET и без подсчета общего числа записей.
+
+    Курсор задает свою сортировку, поэтому с параметрами из
+    cursor_exclude_params, которые сортируют выдачу иначе, параметр
+    ``cursor`` игнорируется и используется постраничная пагинация.
+    """
+
+    cursor_query_param = "cursor"
+    cursor_pagination_class = None
+    cursor_exclude_params = ()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if (
+            self.cursor_pagination_class is not None
+            and self.cursor_query_param in request.query_params
+            and not any(
+                param in request.query_params
+                for param in self.cursor_exclude_params
+            )
+        ):
+            self.cursor_paginator = self.cursor_pagination_class()
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class TitlePagination(PageNumberOrCursorPagination):
+    cursor_pagination_class = TitleCursorPagination
+    # Результаты поиска отсортированы по релевантности.
+    cursor_exclude_params = ("search",)
+
+
+class PubDatePagination(PageNumberOrCursorPagination):
+    cursor_pagination_class = PubDateCursorPagination
@@ -3,6 +3,48 @@ import datetime as dt
 from rest_framework import serializers
 from reviews.models import Category, Comment, Genre, Review, Title, User
 
+from .cache import categories, genres
+
+
+class CachedSlugRelatedField(serializers.SlugRelatedField):
+    """
+    SlugRelatedField, который ищет объект в кеше процесса без запроса
+    к БД.
+    """
+
+    def __init__(self, lookup, **kwargs):
+        self.lookup = lookup
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str):
+            self.fail("invalid")
+        obj = self.lookup.get(data)
+        if obj is None:
+            self.fail(
+                "does_not_exist", slug_name=self.slug_field, value=data
+            )
+        return obj
+
+    def check_exists(self, objects):
+        """
+        Проверка одним запросом, что объекты из кеша есть в БД: объект
+        мог быть удален другим процессом, а запись со ссылкой на него
+        завершилась бы ошибкой внешнего ключа.
+        """
+
+        found = set(
+            self.lookup.model.objects.filter(
+                pk__in=[obj.pk for obj in objects]
+            ).values_list("pk", flat=True)
+        )
+        for obj in objects:
+            if obj.pk not in found:
+                self.lookup.invalidate()
+                self.fail(
+                    "does_not_exist", slug_name=self.slug_field, value=obj.slug
+                )
+
 
 class AdminsSerializer(serializers.ModelSerializer):
     class Meta:
@@ -55,20 +97,20 @@ class TitleUserSerializer(serializers.ModelSerializer):
     rating = serializers.IntegerField(read_only=True)
 
     class Meta:
-        fields = "__all__"
+        exclude = ("rating_sum", "rating_count")
         model = Title
 
 
 class TitleAdminSerializer(serializers.ModelSerializer):
-    category = serializers.SlugRelatedField(
-        queryset=Category.objects.all(), slug_field="slug"
+    category = CachedSlugRelatedField(
+        categories, queryset=Category.objects.all(), slug_field="slug"
     )
-    genre = serializers.SlugRelatedField(
-        queryset=Genre.objects.all(), slug_field="slug", many=True
+    genre = CachedSlugRelatedField(
+        genres, queryset=Genre.objects.all(), slug_field="slug", many=True
     )
 
     class Meta:
-        fields = "__all__"
+        exclude = ("rating_sum", "rating_count", "rating")
         model = Title
 
     def validate_year(self, value):
@@ -77,6 +119,20 @@ class TitleAdminSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Год указан неправильно!")
         return value
 
+    def validate(self, attrs):
+        for name, field in (
+            ("category", self.fields["category"]),
+            ("genre", self.fields["genre"].child_relation),
+        ):
+            value = attrs.get(name)
+            if not value:
+                continue
+            try:
+                field.check_exists(value if name == "genre" else [value])
+            except serializers.ValidationError as error:
+                raise serializers.ValidationError({name: error.detail})
+        return attrs
+
 
 class ReviewSerializer(serializers.ModelSerializer):
     title = serializers.SlugRelatedField(slug_field="name", read_only=True)
@@ -0,0 +1,97 @@
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_migrate
+from django.dispatch import receiver
+
+# Допустимые значения PRAGMA: значение подставляется в SQL, поэтому
+# ключевые слова сверяются со списком, а числа приводятся к int.
+KEYWORD_PRAGMAS = {
+    "journal_mode": {"delete", "truncate", "persist", "memory", "wal", "off"},
+    "synchronous": {"off", "normal", "full", "extra"},
+}
+INTEGER_PRAGMAS = {"mmap_size", "cache_size", "busy_timeout"}
+# Режим журнала хранится в файле БД и задается один раз после migrate.
+PERSISTENT_PRAGMAS = {"journal_mode"}
+
+
+def validate_pragmas(pragmas):
+    """
+    Проверенные значения PRAGMA; пустые значения пропускаются.
+    """
+
+    validated = {}
+    for name, value in pragmas.items():
+        if value in (None, ""):
+            continue
+        if name in KEYWORD_PRAGMAS:
+            value = str(value).lower()
+            if value not in KEYWORD_PRAGMAS[name]:
+                raise ImproperlyConfigured(
+                    f"PRAGMA {name}: недопустимое значение {value!r}, "
+                    f"ожидается одно из {sorted(KEYWORD_PRAGMAS[name])}"
+                )
+        elif name in INTEGER_PRAGMAS:
+            try:
+                value = int(value)
+            except ValueError:
+                raise ImproperlyConfigured(
+                    f"PRAGMA {name}: ожидается целое число, "
+                    f"получено {value!r}"
+                )
+        else:
+            raise ImproperlyConfigured(f"Неизвестная PRAGMA {name}")
+        validated[name] = value
+    return validated
+
+
+def apply_pragmas(connection, pragmas):
+    """
+    Выполняет PRAGMA на соединении sqlite3.
+    """
+
+    for name, value in validate_pragmas(pragmas).items():
+        connection.execute(f"PRAGMA {name} = {value}")
+
+
+def settings_pragmas(persistent):
+    """
+    PRAGMA из настроек: сохраняемые в файле БД или остальные.
+    """
+
+    return {
+        name: value
+        for name, value in settings.SQLITE_PRAGMAS.items()
+        if (name in PERSISTENT_PRAGMAS) == persistent
+    }
+
+
+@receiver(connection_created)
+def setup_sqlite(connection, **kwargs):
+    """
+    synchronous=NORMAL в режиме WAL делает fsync только при checkpoint,
+    а не на каждый коммит. PRAGMA выполняются на соединении sqlite3
+    напрямую и не попадают в счетчики запросов.
+    """
+
+    if connection.vendor == "sqlite":
+        apply_pragmas(connection.connection, settings_pragmas(False))
+
+
+@receiver(post_migrate)
+def setup_journal_mode(using, **kwargs):
+    """
+    WAL позволяет читать во время записи. Режим сохраняется в файле БД,
+    поэтому задается после migrate, а не при каждом соединении.
+    """
+
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return
+    connection.ensure_connection()
+    apply_pragmas(connection.connection, settings_pragmas(True))
+
+
+# Ошибка в .env обнаруживается при запуске, а не при первом запросе.
+validate_pragmas(settings.SQLITE_PRAGMAS)
@@ -1,22 +1,37 @@
 from http import HTTPStatus
 
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db.models import Exists, OuterRef, Prefetch
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import mixins, permissions, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.exceptions import NotFound, ParseError
 from rest_framework.filters import SearchFilter
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 from api_yamdb.settings import ADMIN_EMAIL, USER
-from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.models import (
+    Category,
+    Comment,
+    Genre,
+    OutgoingEmail,
+    Review,
+    Title,
+    User,
+)
 from django.shortcuts import get_object_or_404
 
+from .cache import categories, genres, title_cache
+from .conditional import conditional_get
+from .fast_serializers import (
+    CommentFastSerializer,
+    FastReadMixin,
+    ReviewFastSerializer,
+    TitleFastSerializer,
+)
 from .filters import TitleFilter
+from .pagination import PubDatePagination, TitlePagination
 from .permissons import IsAdmin, IsAdminOrReadOnly, IsAuthorOrModerator
 from .serializers import (
     AdminsSerializer,
@@ -152,14 +167,15 @@ class APISignUp(APIView):
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
 
-        send_mail(
-            "Код для API",
-            (
+        # Письмо уходит в очередь, отправляет его команда send_emails.
+        OutgoingEmail.objects.create(
+            subject="Код для API",
+            body=(
                 f"Здравствуйте, {user.username}!\n"
                 f"Код доступа к API: {user.confirmation_code}"
             ),
-            ADMIN_EMAIL,
-            [user.email],
+            from_email=ADMIN_EMAIL,
+            to_email=user.email,
         )
 
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -198,6 +214,14 @@ class CategoryViewSet(
     search_fields = ("name",)
     lookup_field = "slug"
 
+    def get_queryset(self):
+        # Без поиска список отдается из кеша процесса.
+        if self.action == "list" and not self.request.query_params.get(
+            "search"
+        ):
+            return categories.all()
+        return super().get_queryset()
+
 
 class GenreViewSet(
     mixins.CreateModelMixin,
@@ -232,12 +256,21 @@ class GenreViewSet(
     search_fields = ("name",)
     lookup_field = "slug"
 
+    def get_queryset(self):
+        # Без поиска список отдается из кеша процесса.
+        if self.action == "list" and not self.request.query_params.get(
+            "search"
+        ):
+            return genres.all()
+        return super().get_queryset()
 
-class TitleViewSet(viewsets.ModelViewSet):
+
+class TitleViewSet(FastReadMixin, viewsets.ModelViewSet):
     """
     ViewSet для работы с произведениями.
 
     Получение списка всех произведений: GET /titles/
+    (для пагинации курсором: GET /titles/?cursor=)
 
     Добавление произведения POST /titles/:
     запрос:
@@ -262,18 +295,21 @@ class TitleViewSet(viewsets.ModelViewSet):
     }
 
     Получение информации о произведении: GET /titles/{titles_id}/
+    (ответ без параметров запроса кешируется, заголовок X-Cache: HIT
+    или MISS)
 
     Частичное обновление информации о произведении: PATCH /titles/{titles_id}/
 
     Удаление произведения: DELETE /titles/{titles_id}/
     """
 
-    queryset = queryset = Title.objects.annotate(
-        rating=Avg("reviews__score")
-    ).all()
+    queryset = Title.objects.select_related("category").prefetch_related(
+        Prefetch("genre", queryset=Genre.objects.order_by("pk"))
+    )
+    fast_serializer_class = TitleFastSerializer
     permission_classes = (IsAdminOrReadOnly,)
     filter_backends = (DjangoFilterBackend,)
-    pagination_class = PageNumberPagination
+    pagination_class = TitlePagination
     filterset_class = TitleFilter
 
     def get_serializer_class(self):
@@ -281,38 +317,107 @@ class TitleViewSet(viewsets.ModelViewSet):
             return TitleUserSerializer
         return TitleAdminSerializer
 
-
-class ReviewViewSet(viewsets.ModelViewSet):
+    @conditional_get("titles")
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @conditional_get("title:{pk}")
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            title_id = int(self.kwargs[self.lookup_field])
+        except ValueError:
+            raise NotFound
+        if request.query_params:
+            # Фильтры из параметров запроса могут скрыть произведение,
+            # в кеше лежат ответы без фильтров.
+            return super().retrieve(request, *args, **kwargs)
+        data = title_cache.get(title_id)
+        if data is not None:
+            return Response(data, headers={"X-Cache": "HIT"})
+        response = super().retrieve(request, *args, **kwargs)
+        title_cache.set(title_id, dict(response.data))
+        response["X-Cache"] = "MISS"
+        return response
+
+
+class ReviewViewSet(FastReadMixin, viewsets.ModelViewSet):
     """
     ViewSet для работы с отзывами.
+
+    Отзыв ищется одним запросом вместе с произведением и автором
+    (только поля, нужные сериализатору); выяснение, чего именно
+    не хватает для ответа 404, — только при промахе.
     """
 
     serializer_class = ReviewSerializer
-    pagination_class = PageNumberPagination
+    fast_serializer_class = ReviewFastSerializer
+    pagination_class = PubDatePagination
     permission_classes = (IsAuthorOrModerator,)
 
     def get_queryset(self):
-        title_id = self.kwargs.get("title_id")
-        pk = self.kwargs.get("pk")
-        if not Title.objects.filter(id=title_id).exists():
+        return (
+            Review.objects.filter(title_id=self.kwargs.get("title_id"))
+            .select_related("title", "author")
+            .only(
+                "text",
+                "score",
+                "pub_date",
+                "title__name",
+                "author__username",
+            )
+        )
+
+    def get_review(self):
+        review = self.get_queryset().filter(pk=self.kwargs.get("pk")).first()
+        if review is None:
+            self.raise_not_found()
+        return review
+
+    def get_object(self):
+        review = self.get_review()
+        self.check_object_permissions(self.request, review)
+        return review
+
+    def check_title(self):
+        if not Title.objects.filter(id=self.kwargs.get("title_id")).exists():
             raise NotFound(
                 detail="Произведение не найдено", code=HTTPStatus.NOT_FOUND
             )
-        if pk and not Review.objects.filter(id=pk).exists():
-            raise NotFound(detail="Отзыв не найден", code=HTTPStatus.NOT_FOUND)
-        return Review.objects.filter(title_id=title_id)
+
+    def raise_not_found(self):
+        self.check_title()
+        raise NotFound(detail="Отзыв не найден", code=HTTPStatus.NOT_FOUND)
+
+    @conditional_get("reviews:{title_id}")
+    def list(self, request, *args, **kwargs):
+        self.check_title()
+        return super().list(request, *args, **kwargs)
+
+    @conditional_get("reviews:{title_id}")
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
     def perform_create(self, serializer):
         title_id = self.kwargs.get("title_id")
         text = self.request.data.get("text")
         score = self.request.data.get("score")
-        if not Title.objects.filter(id=title_id).exists():
+        title = (
+            Title.objects.filter(id=title_id)
+            .annotate(
+                reviewed=Exists(
+                    Review.objects.filter(
+                        title=OuterRef("pk"), author=self.request.user
+                    )
+                )
+            )
+            .values("reviewed")
+            .first()
+        )
+        if title is None:
             raise NotFound(
                 detail="Не найдено произведение!!!", code=HTTPStatus.NOT_FOUND
             )
-        if Review.objects.filter(
-            title_id=title_id, author=self.request.user
-        ).exists():
+        if title["reviewed"]:
             raise ParseError(
                 detail="Нельзя добавить больше одного отзыва!",
                 code=HTTPStatus.BAD_REQUEST,
@@ -323,28 +428,17 @@ class ReviewViewSet(viewsets.ModelViewSet):
             score=score,
             author=self.request.user,
         )
-        return Response(status=status.HTTP_201_CREATED)
 
     def partial_update(self, request, pk, title_id):
-        if not Title.objects.filter(id=title_id).exists():
-            return Response(
-                "Не найдено произведение!", status=status.HTTP_404_NOT_FOUND
-            )
-        review = Review.objects.filter(title=title_id, id=pk)
-        if not review.exists():
-            return Response(
-                "Не найден отзыв!", status=status.HTTP_404_NOT_FOUND
-            )
-        review = review.first()
+        review = self.get_review()
         cur_user = request.user
-        review_author = review.author
         cur_user_group = cur_user.role
         if not request.data.get("text") and not request.data.get("score"):
             return Response(
                 "Не передано ни одно из обязательных полей!",
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        if cur_user_group == USER and cur_user != review_author:
+        if cur_user_group == USER and cur_user.pk != review.author_id:
             return Response(
                 "Вы не можете редактировать чужой отзыв!",
                 status=status.HTTP_403_FORBIDDEN,
@@ -357,20 +451,10 @@ class ReviewViewSet(viewsets.ModelViewSet):
             return Response(serializer.data, status=status.HTTP_200_OK)
 
     def destroy(self, request, pk, title_id):
-        if not Title.objects.filter(id=title_id).exists():
-            return Response(
-                "Не найдено произведение!", status=status.HTTP_404_NOT_FOUND
-            )
-        review = Review.objects.filter(title=title_id, id=pk)
-        if not review.exists():
-            return Response(
-                "Отзыв не найден!", status=status.HTTP_404_NOT_FOUND
-            )
+        review = self.get_review()
         cur_user = request.user
-        review = review.first()
-        review_author = review.author
         cur_user_group = cur_user.role
-        if cur_user_group == USER and cur_user != review_author:
+        if cur_user_group == USER and cur_user.pk != review.author_id:
             return Response(
                 "Вы не можете удалить чужой отзыв!",
                 status=status.HTTP_403_FORBIDDEN,
@@ -380,68 +464,86 @@ class ReviewViewSet(viewsets.ModelViewSet):
             return Response("Отзыв удален!", status=status.HTTP_204_NO_CONTENT)
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(FastReadMixin, viewsets.ModelViewSet):
     """
     ViewSet для работы с комментариями.
+
+    Комментарий ищется одним запросом вместе с отзывом и автором,
+    принадлежность отзыва произведению проверяется через JOIN.
     """
 
     serializer_class = CommentSerializer
+    fast_serializer_class = CommentFastSerializer
     permission_classes = (permissions.IsAuthenticatedOrReadOnly,)
-    pagination_class = PageNumberPagination
+    pagination_class = PubDatePagination
 
     def get_queryset(self):
+        return (
+            Comment.objects.filter(
+                review_id=self.kwargs.get("review_id"),
+                review__title_id=self.kwargs.get("title_id"),
+            )
+            .select_related("review", "author")
+            .only("text", "pub_date", "review__text", "author__username")
+        )
+
+    def get_comment(self):
+        comment = self.get_queryset().filter(pk=self.kwargs.get("pk")).first()
+        if comment is None:
+            self.raise_not_found(comment_missing=True)
+        return comment
+
+    def get_object(self):
+        comment = self.get_comment()
+        self.check_object_permissions(self.request, comment)
+        return comment
+
+    def check_review(self):
+        if not Review.objects.filter(
+            id=self.kwargs.get("review_id"),
+            title_id=self.kwargs.get("title_id"),
+        ).exists():
+            self.raise_not_found()
+
+    def raise_not_found(self, comment_missing=False):
         title_id = self.kwargs.get("title_id")
         review_id = self.kwargs.get("review_id")
-        comment_id = self.kwargs.get("pk")
-        if not Review.objects.filter(id=review_id).exists():
-            raise NotFound(detail="Не найден отзыв!", code=404)
         if not Title.objects.filter(id=title_id).exists():
             raise NotFound(
                 detail="Не найдено произведение!", code=HTTPStatus.NOT_FOUND
             )
-        if comment_id and not Comment.objects.filter(id=comment_id).exists():
+        if not comment_missing or not Review.objects.filter(
+            id=review_id, title_id=title_id
+        ).exists():
             raise NotFound(
-                detail="Не найден комментарий!", code=HTTPStatus.NOT_FOUND
+                detail="Не найден отзыв!", code=HTTPStatus.NOT_FOUND
             )
-        return Comment.objects.filter(review=review_id)
+        raise NotFound(
+            detail="Не найден комментарий!", code=HTTPStatus.NOT_FOUND
+        )
+
+    @conditional_get("comments:{review_id}")
+    def list(self, request, *args, **kwargs):
+        self.check_review()
+        return super().list(request, *args, **kwargs)
+
+    @conditional_get("comments:{review_id}")
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
     def perform_create(self, serializer):
-        title_id = self.kwargs.get("title_id")
         review_id = self.kwargs.get("review_id")
         text = self.request.data.get("text")
-        if not Title.objects.filter(id=title_id).exists():
-            raise NotFound(
-                detail="Не найдено произведение!", code=HTTPStatus.NOT_FOUND
-            )
-        if not Review.objects.filter(title_id=title_id, id=review_id).exists():
-            raise NotFound(
-                detail="Не найден отзыв!", code=HTTPStatus.NOT_FOUND
-            )
+        self.check_review()
         serializer.save(
             review_id=review_id, text=text, author=self.request.user
         )
-        return Response(status=status.HTTP_201_CREATED)
 
     def partial_update(self, request, pk, title_id, review_id):
-        comment = Comment.objects.filter(id=pk, review_id=review_id)
-        if not Title.objects.filter(id=title_id).exists():
-            raise NotFound(
-                detail="Не найдено произведение!", code=HTTPStatus.NOT_FOUND
-            )
-        if not Review.objects.filter(id=review_id).exists():
-            raise NotFound(
-                detail="Не найден отзыв!", code=HTTPStatus.NOT_FOUND
-            )
-        if not comment.exists():
-            raise NotFound(
-                detail="Не найден комментарий!", code=HTTPStatus.NOT_FOUND
-            )
-
+        comment = self.get_comment()
         cur_user = request.user
         cur_user_group = cur_user.role
-        comment = comment.first()
-        comment_author = comment.author
-        if cur_user_group == USER and cur_user != comment_author:
+        if cur_user_group == USER and cur_user.pk != comment.author_id:
             return Response(
                 "Вы не можете редактировать чужой комментарий!",
                 status=status.HTTP_403_FORBIDDEN,
@@ -455,24 +557,10 @@ class CommentViewSet(viewsets.ModelViewSet):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     def destroy(self, request, pk, title_id, review_id):
-        if not Title.objects.filter(id=title_id).exists():
-            return Response(
-                "Не найдено произведение!", status=status.HTTP_404_NOT_FOUND
-            )
-        if not Review.objects.filter(id=review_id, title_id=title_id).exists():
-            return Response(
-                "Не найден отзыв!", status=status.HTTP_404_NOT_FOUND
-            )
-        comment = Comment.objects.filter(id=pk, review_id=review_id)
-        if not comment.exists():
-            return Response(
-                "Не найден комментарий!", status=status.HTTP_404_NOT_FOUND
-            )
+        comment = self.get_comment()
         cur_user = request.user
         cur_user_group = cur_user.role
-        comment = comment.first()
-        comment_author = comment.author
-        if cur_user_group == USER and cur_user != comment_author:
+        if cur_user_group == USER and cur_user.pk != comment.author_id:
             return Response(
                 "Вы не можете удалить чужой комментарий!",
                 status=status.HTTP_403_FORBIDDEN,
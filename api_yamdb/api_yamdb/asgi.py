@@ -1,14 +1,18 @@
 """
 ASGI config for YaMDb project.
 It exposes the ASGI callable as a module-level variable named ``application``.
-For more information on this file, see
-https://docs.djangoproject.com/en/3.0/howto/deployment/asgi/
+Django 2.2 has no ASGI support of its own, so the WSGI handler is wrapped
+in api.asgi.ASGIHandler.
 """
 
 import os
 
-from django.core.asgi import get_asgi_application
+from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "api_yamdb.settings")
 
-application = get_asgi_application()
+wsgi_application = get_wsgi_application()
+
+from api.asgi import ASGIHandler  # noqa: E402
+
+application = ASGIHandler(wsgi_application)
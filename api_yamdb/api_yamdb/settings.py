@@ -28,11 +28,12 @@ INSTALLED_APPS = [
     "rest_framework",
     "rest_framework_simplejwt",
     "django_filters",
-    "api",
+    "api.apps.ApiConfig",
     "reviews",
 ]
 
 MIDDLEWARE = [
+    "api.middleware.QueryCountMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -42,6 +43,41 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Заголовки X-Query-Count/Server-Timing и лог запросов к БД.
+QUERY_INSTRUMENTATION = os.getenv(
+    "QUERY_INSTRUMENTATION", default="False"
+).lower() in ("true", "1")
+
+# Версии данных для ETag и кешей API хранятся без срока, поэтому
+# ограничение на число записей больше, чем по умолчанию. ETag и
+# Last-Modified работают только с общим для процессов кешем, например
+# CACHE_BACKEND=django.core.cache.backends.memcached.MemcachedCache
+# и CACHE_LOCATION=127.0.0.1:11211.
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND",
+            default="django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", default=""),
+    }
+}
+# У memcached свой предел памяти, OPTIONS передаются его клиенту.
+if "memcached" not in CACHES["default"]["BACKEND"]:
+    CACHES["default"]["OPTIONS"] = {"MAX_ENTRIES": 10000}
+
+# Срок жизни битовых карт жанров в памяти процесса, в секундах.
+GENRE_INDEX_TTL = int(os.getenv("GENRE_INDEX_TTL", default=300))
+# Срок жизни категорий и жанров в памяти процесса, в секундах.
+LOOKUP_CACHE_TTL = int(os.getenv("LOOKUP_CACHE_TTL", default=300))
+# Срок хранения кешированных ответов GET /titles/{titles_id}/, в секундах.
+TITLE_CACHE_TIMEOUT = int(os.getenv("TITLE_CACHE_TIMEOUT", default=300))
+# Срок хранения пользователей из JWT в памяти процесса, в секундах;
+# 0 — искать пользователя в БД на каждый запрос.
+JWT_USER_CACHE_TTL = int(os.getenv("JWT_USER_CACHE_TTL", default=30))
+# Потоки ASGI-приложения, в которых выполняются представления.
+ASGI_THREADS = int(os.getenv("ASGI_THREADS", default=8))
+
 ROOT_URLCONF = "api_yamdb.urls"
 
 TEMPLATES_DIR = os.path.join(BASE_DIR, "templates")
@@ -73,6 +109,19 @@ DATABASES = {
     }
 }
 
+# PRAGMA для каждого нового соединения с SQLite (api/sqlite.py);
+# journal_mode хранится в файле БД и задается после migrate.
+# Пустое значение в .env оставляет умолчание SQLite.
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", default="wal"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", default="normal"),
+    # 256 МиБ файла БД читаются через mmap.
+    "mmap_size": os.getenv("SQLITE_MMAP_SIZE", default="268435456"),
+    # Отрицательное значение — размер кеша страниц в КиБ (64 МиБ).
+    "cache_size": os.getenv("SQLITE_CACHE_SIZE", default="-65536"),
+    "busy_timeout": os.getenv("SQLITE_BUSY_TIMEOUT", default="5000"),
+}
+
 
 # Password validation
 
@@ -113,13 +162,23 @@ STATICFILES_DIRS = (os.path.join(BASE_DIR, "static/"),)
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "api.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend",
     ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
     "PAGE_SIZE": 10,
+    # JSON через orjson; без него — стандартный json из DRF.
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "api.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
 
 SIMPLE_JWT = {
@@ -135,6 +194,17 @@ EMAIL_BACKEND = "django.core.mail.backends.filebased.EmailBackend"
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, "sent_emails")
 
 ADMIN_EMAIL = "support_api@mail.com"
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "api.queries": {"handlers": ["console"], "level": "INFO"},
+    },
+}
 USER = "user"
 ADMIN = "admin"
 MODERATOR = "moderator"
@@ -1,6 +1,14 @@
 from django.contrib import admin
 
-from .models import Category, Comment, Genre, Review, Title, User
+from .models import (
+    Category,
+    Comment,
+    Genre,
+    OutgoingEmail,
+    Review,
+    Title,
+    User,
+)
 
 
 class UserAdmin(admin.ModelAdmin):
@@ -33,9 +41,15 @@ class CategoryAdmin(admin.ModelAdmin):
     empty_value_display = "-пусто-"
 
 
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = ("to_email", "subject", "created", "attempts", "sent_at")
+    empty_value_display = "-пусто-"
+
+
 admin.site.register(User, UserAdmin)
 admin.site.register(Review, ReviewAdmin)
 admin.site.register(Comment, CommentAdmin)
 admin.site.register(Title, TitleAdmin)
 admin.site.register(Genre, GenreAdmin)
 admin.site.register(Category, CategoryAdmin)
+admin.site.register(OutgoingEmail, OutgoingEmailAdmin)
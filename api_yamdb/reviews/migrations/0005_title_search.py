@@ -0,0 +1,90 @@
+from django.db import migrations
+
+# Полнотекстовый индекс по названию и описанию произведения.
+# SQLite: таблица FTS5 с внешним содержимым, которую синхронизируют
+# триггеры, — индекс обновляется при любой записи в reviews_title,
+# в том числе при импорте в обход ORM. Если миграция пересоздаст
+# таблицу reviews_title, триггеры нужно создать заново.
+SQLITE_FORWARD = (
+    """
+    CREATE VIRTUAL TABLE reviews_title_fts USING fts5(
+        name,
+        description,
+        content='reviews_title',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER reviews_title_fts_ai AFTER INSERT ON reviews_title BEGIN
+        INSERT INTO reviews_title_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER reviews_title_fts_ad AFTER DELETE ON reviews_title BEGIN
+        INSERT INTO reviews_title_fts(reviews_title_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER reviews_title_fts_au
+    AFTER UPDATE OF name, description ON reviews_title BEGIN
+        INSERT INTO reviews_title_fts(reviews_title_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO reviews_title_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    "INSERT INTO reviews_title_fts(reviews_title_fts) VALUES ('rebuild')",
+)
+SQLITE_BACKWARD = (
+    "DROP TRIGGER IF EXISTS reviews_title_fts_au",
+    "DROP TRIGGER IF EXISTS reviews_title_fts_ad",
+    "DROP TRIGGER IF EXISTS reviews_title_fts_ai",
+    "DROP TABLE IF EXISTS reviews_title_fts",
+)
+# PostgreSQL: GIN-индекс по выражению, совпадающему с TITLE_SEARCH_VECTOR
+# в api/filters.py.
+POSTGRESQL_FORWARD = (
+    """
+    CREATE INDEX reviews_title_search_idx ON reviews_title USING GIN (
+        to_tsvector(
+            'simple', coalesce(name, '') || ' ' || coalesce(description, '')
+        )
+    )
+    """,
+)
+POSTGRESQL_BACKWARD = ("DROP INDEX IF EXISTS reviews_title_search_idx",)
+
+
+def run_for_vendor(statements):
+    def run(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, ()):
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reviews", "0004_title_rating"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_for_vendor(
+                {
+                    "sqlite": SQLITE_FORWARD,
+                    "postgresql": POSTGRESQL_FORWARD,
+                }
+            ),
+            run_for_vendor(
+                {
+                    "sqlite": SQLITE_BACKWARD,
+                    "postgresql": POSTGRESQL_BACKWARD,
+                }
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 2.2.16 on 2026-10-18 04:48
+
+from django.db import migrations, models
+import reviews.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reviews", "0007_outgoing_email"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="user",
+            name="confirmation_code",
+            field=models.CharField(
+                default=reviews.models.generate_confirmation_code,
+                max_length=255,
+                null=True,
+                verbose_name="Код подтверждения",
+            ),
+        ),
+    ]
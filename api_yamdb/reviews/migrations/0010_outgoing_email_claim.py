@@ -0,0 +1,27 @@
+# Generated by Django 2.2.16 on 2026-10-18 05:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reviews", "0009_import_checkpoint"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="outgoingemail",
+            name="claim_token",
+            field=models.UUIDField(
+                blank=True, null=True, verbose_name="Метка отправителя"
+            ),
+        ),
+        migrations.AddField(
+            model_name="outgoingemail",
+            name="claimed_at",
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name="Взято в отправку"
+            ),
+        ),
+    ]
@@ -3,8 +3,19 @@ import random
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
-from django.db.models.signals import post_save
+from django.db.models import (
+    Avg,
+    Count,
+    F,
+    FloatField,
+    OuterRef,
+    Subquery,
+    Sum,
+)
+from django.db.models.functions import Cast, Coalesce, NullIf
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
+from django.utils import timezone
 
 from .validators import validate_username, validate_year
 from api_yamdb.settings import USER, ADMIN, MODERATOR
@@ -13,6 +24,16 @@ from api_yamdb.settings import USER, ADMIN, MODERATOR
 ROLE_CHOICES = [(USER, USER), (ADMIN, ADMIN), (MODERATOR, MODERATOR)]
 
 
+def generate_confirmation_code():
+    """
+    Код подтверждения из четырех разных цифр. Используется как значение
+    по умолчанию, поэтому код есть у пользователя уже при создании
+    объекта — в том числе при bulk_create — и сохраняется одним INSERT.
+    """
+
+    return "".join(random.sample(tuple(map(str, range(0, 10))), 4))
+
+
 class User(AbstractUser):
     username = models.CharField(
         max_length=150,
@@ -34,6 +55,7 @@ class User(AbstractUser):
         "Код подтверждения",
         max_length=255,
         null=True,
+        default=generate_confirmation_code,
     )
 
     @property
@@ -57,16 +79,6 @@ class User(AbstractUser):
         return self.username
 
 
-@receiver(post_save, sender=User)
-def post_save(instance, created, **kwargs):
-    if created:
-        confirmation_code = "".join(
-            random.sample(tuple(map(str, range(0, 10))), 4)
-        )
-        instance.confirmation_code = confirmation_code
-        instance.save()
-
-
 class Category(models.Model):
     name = models.CharField("Категория", max_length=256)
     slug = models.SlugField(
@@ -113,10 +125,24 @@ class Title(models.Model):
     genre = models.ManyToManyField(
         Genre, related_name="titles", verbose_name="Жанр"
     )
+    rating_sum = models.PositiveIntegerField(
+        "Сумма оценок", default=0, editable=False
+    )
+    rating_count = models.PositiveIntegerField(
+        "Количество оценок", default=0, editable=False
+    )
+    rating = models.FloatField(
+        "Рейтинг", null=True, blank=True, editable=False
+    )
 
     class Meta:
         verbose_name = "Произведение"
         verbose_name_plural = "Произведения"
+        indexes = (
+            models.Index(
+                fields=("category", "year"), name="title_category_year_idx"
+            ),
+        )
 
     def __str__(self):
         return self.name
@@ -147,6 +173,15 @@ class Review(models.Model):
         "Дата публикации", auto_now_add=True, db_index=True
     )
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Запоминаем сохраненные оценку и произведение, чтобы при
+        # обновлении отзыва пересчитать рейтинг без лишнего запроса.
+        instance._loaded_score = instance.__dict__.get("score")
+        instance._loaded_title_id = instance.__dict__.get("title_id")
+        return instance
+
     class Meta:
         verbose_name = "Отзыв"
         verbose_name_plural = "Отзывы"
@@ -159,12 +194,85 @@ class Review(models.Model):
                 name="unique-review",
             )
         ]
+        indexes = (
+            models.Index(
+                fields=("title", "pub_date"), name="review_title_pub_date_idx"
+            ),
+        )
         ordering = ("pub_date",)
 
     def __str__(self):
         return self.text
 
 
+def change_title_rating(title_id, score_delta, count_delta):
+    """
+    Атомарное изменение хранимого рейтинга произведения.
+
+    Сумма и количество оценок меняются одним UPDATE через F-выражения,
+    средняя оценка вычисляется в том же запросе из старых значений.
+    """
+
+    new_sum = F("rating_sum") + score_delta
+    new_count = F("rating_count") + count_delta
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=new_sum,
+        rating_count=new_count,
+        rating=Cast(new_sum, FloatField()) / NullIf(new_count, 0),
+    )
+
+
+def recalculate_title_ratings(queryset=None):
+    """
+    Полный пересчет хранимого рейтинга по таблице отзывов.
+
+    Возвращает количество обновленных произведений.
+    """
+
+    if queryset is None:
+        queryset = Title.objects.all()
+    reviews = (
+        Review.objects.filter(title=OuterRef("pk"))
+        .order_by()
+        .values("title")
+    )
+    return queryset.update(
+        rating_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum("score")).values("total")),
+            0,
+        ),
+        rating_count=Coalesce(
+            Subquery(reviews.annotate(total=Count("id")).values("total")),
+            0,
+        ),
+        rating=Subquery(reviews.annotate(avg=Avg("score")).values("avg")),
+    )
+
+
+@receiver(post_save, sender=Review)
+def review_post_save(instance, created, **kwargs):
+    score = int(instance.score)
+    old_score = getattr(instance, "_loaded_score", None)
+    old_title_id = getattr(instance, "_loaded_title_id", None)
+    if created:
+        change_title_rating(instance.title_id, score, 1)
+    elif old_score is None:
+        # Исходная оценка неизвестна: пересчитываем рейтинг целиком.
+        recalculate_title_ratings(Title.objects.filter(pk=instance.title_id))
+    elif old_title_id != instance.title_id:
+        change_title_rating(old_title_id, -int(old_score), -1)
+        change_title_rating(instance.title_id, score, 1)
+    elif int(old_score) != score:
+        change_title_rating(instance.title_id, score - int(old_score), 0)
+    instance._loaded_score = score
+    instance._loaded_title_id = instance.title_id
+
+
+@receiver(post_delete, sender=Review)
+def review_post_delete(instance, **kwargs):
+    change_title_rating(instance.title_id, -int(instance.score), -1)
+
+
 class Comment(models.Model):
     review = models.ForeignKey(
         Review,
@@ -186,6 +294,67 @@ class Comment(models.Model):
     class Meta:
         verbose_name = "Комментарий"
         verbose_name_plural = "Комментарии"
+        indexes = (
+            models.Index(
+                fields=("review", "pub_date"),
+                name="comment_review_pub_date_idx",
+            ),
+        )
+        ordering = ("pub_date",)
 
     def __str__(self):
         return self.text[:20]
+
+
+class OutgoingEmail(models.Model):
+    """
+    Письмо в очереди на отправку. Очередь разбирает команда send_emails.
+    """
+
+    subject = models.CharField("Тема", max_length=255)
+    body = models.TextField("Текст")
+    from_email = models.EmailField("Отправитель", max_length=254)
+    to_email = models.EmailField("Получатель", max_length=254)
+    created = models.DateTimeField("Дата создания", auto_now_add=True)
+    attempts = models.PositiveSmallIntegerField("Попыток отправки", default=0)
+    next_attempt_at = models.DateTimeField(
+        "Следующая попытка", default=timezone.now
+    )
+    sent_at = models.DateTimeField("Дата отправки", null=True, blank=True)
+    last_error = models.TextField("Последняя ошибка", blank=True)
+    # Отправитель, который взял письмо, и когда: параллельные запуски
+    # send_emails не отправляют одно письмо дважды.
+    claim_token = models.UUIDField("Метка отправителя", null=True, blank=True)
+    claimed_at = models.DateTimeField(
+        "Взято в отправку", null=True, blank=True
+    )
+
+    class Meta:
+        verbose_name = "Исходящее письмо"
+        verbose_name_plural = "Исходящие письма"
+        indexes = (
+            models.Index(
+                fields=("sent_at", "next_attempt_at"),
+                name="outgoing_email_pending_idx",
+            ),
+        )
+
+    def __str__(self):
+        return f"{self.to_email}: {self.subject}"
+
+
+class ImportCheckpoint(models.Model):
+    """
+    Количество сохраненных строк csv-файла для import_data --resume.
+    Обновляется в той же транзакции, что и вставка строк.
+    """
+
+    file = models.CharField("Файл", max_length=1024, unique=True)
+    rows = models.PositiveIntegerField("Сохранено строк", default=0)
+
+    class Meta:
+        verbose_name = "Контрольная точка импорта"
+        verbose_name_plural = "Контрольные точки импорта"
+
+    def __str__(self):
+        return f"{self.file}: {self.rows}"
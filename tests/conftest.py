@@ -1,6 +1,7 @@
 import os
 import sys
 
+import pytest
 from django.utils.version import get_version
 
 root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -33,3 +34,28 @@ assert get_version() < "3.0.0", "Пожалуйста, используйте в
 pytest_plugins = [
     "tests.fixtures.fixture_user",
 ]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # БД очищается после каждого теста без сигналов, версии кешей
+    # API нужно сбросить вместе с ней.
+    from django.core.cache import cache
+
+    cache.clear()
+
+
+@pytest.fixture
+def shared_cache(settings, tmp_path):
+    # Кеш в файлах общий для всех процессов, в отличие от кеша
+    # в памяти процесса по умолчанию.
+    from django.core.cache import cache
+
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": str(tmp_path),
+        }
+    }
+    yield
+    cache.clear()
@@ -1,6 +1,9 @@
+import io
+
 import pytest
 from django.contrib.auth import get_user_model
 from django.core import mail
+from django.core.management import call_command
 
 User = get_user_model()
 
@@ -81,6 +84,12 @@ class Test00UserRegistration:
         valid_data = {"email": valid_email, "username": valid_username}
         request_type = "POST"
         response = client.post(self.url_signup, data=valid_data)
+        # Письмо ставится в очередь и уходит при разборе очереди.
+        assert len(mail.outbox) == outbox_before_count, (
+            f"Проверьте, что при {request_type} запросе `{self.url_signup}` "
+            f"письмо не отправляется во время запроса"
+        )
+        call_command("send_emails", stdout=io.StringIO())
         outbox_after = mail.outbox  # email outbox after user create
 
         assert (
@@ -125,6 +134,7 @@ class Test00UserRegistration:
         valid_data = {"email": valid_email, "username": valid_username}
         request_type = "POST"
         response = admin_client.post(self.url_admin_create_user, data=valid_data)
+        call_command("send_emails", stdout=io.StringIO())
         outbox_after = mail.outbox
 
         assert (
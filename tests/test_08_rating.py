@@ -0,0 +1,56 @@
+import pytest
+from django.core.management import call_command
+
+from .common import create_reviews
+
+
+class Test08TitleRating:
+    @pytest.mark.django_db(transaction=True)
+    def test_01_rating_follows_reviews(self, admin_client, admin):
+        from reviews.models import Title
+
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        title = Title.objects.get(id=titles[0]["id"])
+        assert (title.rating_sum, title.rating_count) == (12, 3), (
+            "Проверьте, что при создании отзыва обновляются "
+            "`rating_sum` и `rating_count` произведения"
+        )
+        assert title.rating == 4
+
+        admin_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/',
+            data={"score": 8},
+        )
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (15, 3), (
+            "Проверьте, что при изменении оценки отзыва "
+            "пересчитывается рейтинг произведения"
+        )
+        assert title.rating == 5
+
+        for review in reviews:
+            admin_client.delete(
+                f'/api/v1/titles/{titles[0]["id"]}/reviews/{review["id"]}/'
+            )
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (0, 0)
+        assert title.rating is None, (
+            "Проверьте, что рейтинг произведения без отзывов равен `None`"
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_recalculate_ratings_command(self, admin_client, admin):
+        from reviews.models import Title
+
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        Title.objects.update(rating_sum=0, rating_count=0, rating=None)
+        call_command("recalculate_ratings")
+        title = Title.objects.get(id=titles[0]["id"])
+        assert (title.rating_sum, title.rating_count) == (12, 3), (
+            "Проверьте, что команда `recalculate_ratings` "
+            "восстанавливает рейтинг по отзывам"
+        )
+        assert title.rating == 4
+        empty = Title.objects.get(id=titles[1]["id"])
+        assert (empty.rating_sum, empty.rating_count) == (0, 0)
+        assert empty.rating is None
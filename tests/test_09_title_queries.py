@@ -0,0 +1,45 @@
+import pytest
+
+from .common import create_titles
+
+
+class Test09TitleQueries:
+    # COUNT для пагинации, выборка произведений с категориями
+    # и один prefetch жанров.
+    TITLE_LIST_QUERIES = 3
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_title_list_query_budget(
+        self, client, admin_client, django_assert_num_queries
+    ):
+        from reviews.models import Category, Genre, Title
+
+        titles, _, _ = create_titles(admin_client)
+        with django_assert_num_queries(self.TITLE_LIST_QUERIES):
+            response = client.get("/api/v1/titles/")
+        assert response.status_code == 200
+        assert len(response.json()["results"]) == len(titles)
+
+        category = Category.objects.first()
+        genres = list(Genre.objects.all())
+        for i in range(8):
+            title = Title.objects.create(
+                name=f"Произведение {i}", year=2000, category=category
+            )
+            title.genre.set(genres)
+        with django_assert_num_queries(self.TITLE_LIST_QUERIES):
+            response = client.get("/api/v1/titles/")
+        assert len(response.json()["results"]) == 10, (
+            "Проверьте, что количество запросов к БД при GET запросе "
+            "`/api/v1/titles/` не зависит от размера страницы"
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_title_detail_query_budget(
+        self, client, admin_client, django_assert_num_queries
+    ):
+        titles, _, _ = create_titles(admin_client)
+        with django_assert_num_queries(2):
+            response = client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert response.status_code == 200
+        assert len(response.json()["genre"]) == 2
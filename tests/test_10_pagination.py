@@ -0,0 +1,48 @@
+import pytest
+
+from .common import create_comments, create_titles
+
+
+class Test10CursorPagination:
+    @pytest.mark.django_db(transaction=True)
+    def test_01_title_cursor(self, client, admin_client):
+        from reviews.models import Title
+
+        create_titles(admin_client)
+        for i in range(11):
+            Title.objects.create(name=f"Произведение {i}", year=2000)
+        response = client.get("/api/v1/titles/?cursor=")
+        assert response.status_code == 200
+        data = response.json()
+        assert "count" not in data, (
+            "Проверьте, что в режиме `cursor` не выполняется подсчет записей"
+        )
+        ids = [title["id"] for title in data["results"]]
+        assert len(ids) == 10 and ids == sorted(ids)
+        assert data["previous"] is None and data["next"]
+
+        data = client.get(data["next"]).json()
+        next_ids = [title["id"] for title in data["results"]]
+        assert len(next_ids) == 3 and min(next_ids) > max(ids), (
+            "Проверьте, что вторая страница курсора продолжает первую"
+        )
+        assert data["next"] is None
+
+        response = client.get("/api/v1/titles/")
+        assert response.json()["count"] == 13, (
+            "Проверьте, что без `cursor` сохраняется постраничная пагинация"
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_review_and_comment_cursor(self, client, admin_client, admin):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        data = client.get(f"{url}?cursor=").json()
+        assert [review["id"] for review in data["results"]] == [
+            review["id"] for review in reviews
+        ]
+        url = f'{url}{reviews[0]["id"]}/comments/'
+        data = client.get(f"{url}?cursor=").json()
+        assert [comment["id"] for comment in data["results"]] == [
+            comment["id"] for comment in comments
+        ]
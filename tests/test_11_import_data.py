@@ -0,0 +1,219 @@
+import json
+import os
+import multiprocessing
+import shutil
+
+import pytest
+from django.core.management import call_command
+
+from .conftest import MANAGE_PATH
+
+DATA_PATH = os.path.join(MANAGE_PATH, "static", "data")
+
+
+def dying_worker(queue, file_name, *args):
+    # Как процесс, убитый по нехватке памяти: без сообщения в очереди.
+    os._exit(9)
+
+
+@pytest.fixture
+def csv_dir(tmp_path):
+    # В репозитории файлы лежат с префиксом `_`, чтобы импорт
+    # не запускался на них случайно.
+    for file_name in os.listdir(DATA_PATH):
+        shutil.copy(
+            os.path.join(DATA_PATH, file_name),
+            tmp_path / file_name.lstrip("_"),
+        )
+    return tmp_path
+
+
+class Test11ImportData:
+    @pytest.mark.django_db(transaction=True)
+    def test_01_import_data(self, csv_dir):
+        from reviews.models import Category, Comment, Genre, Review, Title
+
+        # В примере данных нет users.csv: отзывы ссылаются на
+        # отсутствующих пользователей.
+        call_command(
+            "import_data",
+            path=str(csv_dir),
+            batch_size=10,
+            allow_broken_links=True,
+        )
+        assert Category.objects.count() == 3
+        assert Genre.objects.count() == 15
+        assert Title.objects.count() == 32
+        assert Review.objects.count() == 72
+        assert Title.objects.get(id=1).genre.count() == 1
+        comment = Comment.objects.get(id=3)
+        assert '"четверть фунта"' in comment.text, (
+            "Проверьте, что команда `import_data` сохраняет кавычки "
+            "в тексте без искажений"
+        )
+        title = Title.objects.get(id=1)
+        assert title.rating_count == Review.objects.filter(title=title).count()
+        assert title.rating is not None, (
+            "Проверьте, что после импорта пересчитывается рейтинг произведений"
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_import_data_resume(self, csv_dir):
+        from django.db import IntegrityError
+        from reviews.models import ImportCheckpoint, Review
+
+        review_file = csv_dir / "review.csv"
+        original = review_file.read_bytes()
+        with open(review_file, "a", encoding="utf-8") as file:
+            # Повтор id первого отзыва прерывает импорт на последней пачке.
+            file.write('\n1,1,"дубль",100,5,2019-09-24T21:08:21.567Z\n')
+        with pytest.raises(IntegrityError):
+            call_command("import_data", path=str(csv_dir), batch_size=10)
+        checkpoint = ImportCheckpoint.objects.get(
+            file=str(csv_dir / "review.csv")
+        )
+        assert checkpoint.rows == 70, (
+            "Проверьте, что в контрольной точке записан номер последней "
+            "сохраненной строки"
+        )
+        assert Review.objects.count() == 70
+
+        review_file.write_bytes(original)
+        call_command(
+            "import_data",
+            path=str(csv_dir),
+            batch_size=10,
+            resume=True,
+            allow_broken_links=True,
+        )
+        assert Review.objects.count() == 72, (
+            "Проверьте, что `--resume` продолжает импорт с места остановки"
+        )
+        assert not ImportCheckpoint.objects.exists()
+
+    def test_03_import_stages(self):
+        from api.management.commands.import_data import (
+            FILES_TBLS_LIST,
+            import_stages,
+        )
+
+        stages = import_stages(FILES_TBLS_LIST.keys())
+        assert stages == [
+            ["category.csv", "genre.csv", "users.csv"],
+            ["titles.csv"],
+            ["genre_title.csv", "review.csv"],
+            ["comments.csv"],
+        ], "Проверьте порядок загрузки файлов по зависимостям"
+        assert import_stages(["comments.csv", "titles.csv"]) == [
+            ["comments.csv", "titles.csv"]
+        ]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_import_data_single_process(self, csv_dir):
+        from io import StringIO
+
+        from django.core.management import CommandError
+        from reviews.models import Review, Title
+
+        stderr = StringIO()
+        with pytest.raises(CommandError, match="reviews_review"):
+            call_command(
+                "import_data", path=str(csv_dir), jobs=1, stderr=stderr
+            )
+        assert Title.objects.count() == 32
+        assert Review.objects.count() == 72
+        assert "reviews_review" in stderr.getvalue(), (
+            "Проверьте, что после импорта выводятся нарушения внешних ключей"
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_export_data(self, admin_client, admin, tmp_path):
+        from reviews.models import Comment, Review, Title
+
+        from .common import create_comments
+
+        create_comments(admin_client, admin)
+        call_command("export_data", path=str(tmp_path / "csv"), chunk_size=2)
+        with open(tmp_path / "csv" / "review.csv", encoding="utf-8") as file:
+            assert file.readline().strip() == (
+                "id,title_id,text,author,score,pub_date"
+            )
+            assert len(file.readlines()) == Review.objects.count()
+
+        call_command(
+            "export_data", path=str(tmp_path / "json"), format="ndjson"
+        )
+        with open(
+            tmp_path / "json" / "titles.ndjson", encoding="utf-8"
+        ) as file:
+            titles = [json.loads(line) for line in file]
+        assert [title["name"] for title in titles] == list(
+            Title.objects.order_by("pk").values_list("name", flat=True)
+        )
+
+        Comment.objects.all().delete()
+        Review.objects.all().delete()
+        for file_name in os.listdir(tmp_path / "csv"):
+            if file_name not in ("review.csv", "comments.csv"):
+                os.remove(tmp_path / "csv" / file_name)
+        call_command("import_data", path=str(tmp_path / "csv"), jobs=1)
+        assert Review.objects.count() == 3 and Comment.objects.count() == 3, (
+            "Проверьте, что выгрузку `export_data` можно загрузить "
+            "командой `import_data`"
+        )
+        assert Title.objects.get(id=titles[0]["id"]).rating == 4
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.skipif(
+        multiprocessing.get_start_method() != "fork",
+        reason="Подмена функции в дочернем процессе требует fork",
+    )
+    def test_06_dead_worker(self, csv_dir, monkeypatch):
+        from django.core.management import CommandError
+
+        from api.management.commands import import_data
+
+        monkeypatch.setattr(import_data, "parse_worker", dying_worker)
+        monkeypatch.setattr(import_data, "WORKER_POLL_TIMEOUT", 0.1)
+        with pytest.raises(CommandError, match="код 9"):
+            call_command("import_data", path=str(csv_dir), jobs=2)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_07_export_import_round_trip(self, admin_client, admin, tmp_path):
+        from reviews.models import (
+            Category,
+            Comment,
+            Genre,
+            Review,
+            Title,
+            User,
+        )
+
+        from .common import create_comments
+
+        create_comments(admin_client, admin)
+        orphan = Title.objects.create(name="Без категории", year=2000)
+        models = (User, Category, Genre, Title, Review, Comment)
+        before = {
+            model: list(model.objects.order_by("pk").values())
+            for model in models
+        }
+        call_command("export_data", path=str(tmp_path))
+        for model in reversed(models):
+            model.objects.all().delete()
+
+        call_command("import_data", path=str(tmp_path), jobs=1)
+        title = Title.objects.get(pk=orphan.pk)
+        assert title.category_id is None and title.description is None, (
+            "Проверьте, что NULL сохраняется при выгрузке и загрузке"
+        )
+        for model in (Category, Genre, Title, Review, Comment):
+            assert list(model.objects.order_by("pk").values()) == (
+                before[model]
+            ), f"Проверьте, что {model.__name__} совпадает после загрузки"
+        assert list(
+            User.objects.order_by("pk").values("username", "bio", "role")
+        ) == [
+            {key: user[key] for key in ("username", "bio", "role")}
+            for user in before[User]
+        ]
@@ -0,0 +1,36 @@
+import pytest
+from django.core.management import call_command
+
+
+class Test12GenerateData:
+    @pytest.mark.django_db(transaction=True)
+    def test_01_generate_data(self, admin):
+        from django.db.models import Count
+        from reviews.models import Comment, Genre, Review, Title, User
+
+        call_command(
+            "generate_data",
+            users=20,
+            titles=10,
+            genres=5,
+            reviews=60,
+            comments=30,
+            batch_size=7,
+            seed=1,
+        )
+        assert User.objects.count() == 21
+        assert Title.objects.count() == 10
+        assert Genre.objects.count() == 5
+        assert Comment.objects.count() == 30
+        assert 30 <= Review.objects.count() <= 90
+        assert not Title.objects.annotate(genres=Count("genre")).filter(
+            genres=0
+        ), "Проверьте, что у каждого произведения есть жанр"
+        assert Review.objects.values("pub_date").distinct().count() > 1, (
+            "Проверьте, что даты отзывов распределены во времени"
+        )
+        for title in Title.objects.all():
+            reviews = Review.objects.filter(title=title)
+            assert title.rating_count == reviews.count(), (
+                "Проверьте, что после генерации пересчитывается рейтинг"
+            )
@@ -0,0 +1,75 @@
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+
+
+class Test13Benchmark:
+    @pytest.mark.django_db(transaction=True)
+    def test_01_query_counts_within_baseline(self):
+        # Время ответа зависит от машины, поэтому в тестах с baseline
+        # сравнивается только количество запросов к БД. Прогрев нужен,
+        # чтобы кешированные ответы замерялись так же, как в baseline.
+        call_command(
+            "benchmark_api",
+            current_db=True,
+            requests=2,
+            warmup=1,
+            skip_latency=True,
+        )
+
+    def run_update(self, tmp_path, update_baseline):
+        from api.management.commands.benchmark_api import BASELINE_FILE
+
+        with open(BASELINE_FILE, encoding="utf-8") as file:
+            baseline = json.load(file)
+        # Замеренное время не бывает отрицательным: по нему видно,
+        # какие адреса были перезаписаны.
+        for result in baseline.values():
+            result["p50_ms"] = -1
+        changed, removed = sorted(baseline)[:2]
+        baseline[changed]["queries"] += 10
+        del baseline[removed]
+        path = tmp_path / "baseline.json"
+        path.write_text(json.dumps(baseline), encoding="utf-8")
+        call_command(
+            "benchmark_api",
+            current_db=True,
+            requests=2,
+            warmup=1,
+            baseline=str(path),
+            update_baseline=update_baseline,
+            stdout=io.StringIO(),
+        )
+        updated = json.loads(path.read_text(encoding="utf-8"))
+        return baseline, updated, changed, removed
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_update_baseline_changes_only_affected_entries(self, tmp_path):
+        baseline, updated, changed, removed = self.run_update(tmp_path, [])
+
+        assert set(updated) == set(baseline) | {removed}, (
+            "Новый адрес должен добавляться в baseline"
+        )
+        assert updated[changed]["queries"] == (
+            baseline[changed]["queries"] - 10
+        ), "Изменившееся количество запросов должно попадать в baseline"
+        for name in set(baseline) - {changed}:
+            assert updated[name] == baseline[name], (
+                "Остальные адреса в baseline не должны меняться"
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_update_baseline_named_entries(self, tmp_path):
+        baseline, updated, changed, removed = self.run_update(
+            tmp_path, ["genres_list"]
+        )
+
+        assert updated[changed] == baseline[changed], (
+            "С указанными адресами остальные адреса не должны меняться"
+        )
+        assert removed in updated, "Новый адрес должен добавляться в baseline"
+        assert updated["genres_list"]["p50_ms"] >= 0, (
+            "Указанный адрес должен перезаписываться в baseline"
+        )
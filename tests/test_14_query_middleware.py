@@ -0,0 +1,29 @@
+import pytest
+
+from .common import create_comments
+
+
+class Test14QueryCountMiddleware:
+    @pytest.mark.django_db(transaction=True)
+    def test_01_query_headers(self, client, admin_client, admin, settings):
+        from django.test import Client
+
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/comments/'
+        )
+        response = client.get(url)
+        assert "X-Query-Count" not in response, (
+            "Проверьте, что без QUERY_INSTRUMENTATION заголовки не добавляются"
+        )
+
+        settings.QUERY_INSTRUMENTATION = True
+        response = Client().get(url)
+        assert response.status_code == 200
+        assert int(response["X-Query-Count"]) > 0, (
+            "Проверьте, что в заголовке X-Query-Count передается "
+            "количество запросов к БД"
+        )
+        assert response["Server-Timing"].startswith("db;dur=")
+        assert "total;dur=" in response["Server-Timing"]
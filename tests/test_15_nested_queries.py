@@ -0,0 +1,102 @@
+import pytest
+
+from .common import auth_client, create_comments
+
+
+class Test15NestedLookupQueries:
+    @pytest.mark.django_db(transaction=True)
+    def test_01_review_lookup(
+        self, client, admin_client, admin, django_assert_num_queries
+    ):
+        comments, reviews, titles, user, _ = create_comments(
+            admin_client, admin
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        # Отзыв вместе с произведением и автором.
+        with django_assert_num_queries(1):
+            response = client.get(f'{url}{reviews[0]["id"]}/')
+        assert response.status_code == 200
+
+        response = client.get(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/{reviews[0]["id"]}/'
+        )
+        assert response.status_code == 404, (
+            "Проверьте, что отзыв другого произведения не найден"
+        )
+        response = client.get(f'/api/v1/titles/999/reviews/{reviews[0]["id"]}/')
+        assert response.status_code == 404
+
+        user_client = auth_client(user)
+        # Отзыв с произведением и автором, UPDATE отзыва и рейтинга;
+        # пользователь из токена уже в кеше процесса.
+        with django_assert_num_queries(3):
+            response = user_client.patch(
+                f'{url}{reviews[1]["id"]}/', data={"score": 2}
+            )
+        assert response.status_code == 200
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_comment_lookup(
+        self, client, admin_client, admin, django_assert_num_queries
+    ):
+        comments, reviews, titles, user, _ = create_comments(
+            admin_client, admin
+        )
+        url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/comments/'
+        )
+        # Комментарий вместе с отзывом и автором.
+        with django_assert_num_queries(1):
+            response = client.get(f'{url}{comments[0]["id"]}/')
+        assert response.status_code == 200
+
+        response = client.get(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/comments/{comments[0]["id"]}/'
+        )
+        assert response.status_code == 404, (
+            "Проверьте, что комментарий к отзыву другого произведения "
+            "не найден"
+        )
+        response = client.get(f"{url}999/")
+        assert response.status_code == 404
+
+        user_client = auth_client(user)
+        # Комментарий с отзывом, BEGIN и DELETE: удаление идет
+        # в транзакции из-за обработчика post_delete, который меняет
+        # версию комментариев для ETag. Пользователь из токена уже
+        # в кеше процесса.
+        with django_assert_num_queries(3):
+            response = user_client.delete(f'{url}{comments[1]["id"]}/')
+        assert response.status_code == 204
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_list_query_budget(
+        self, client, admin_client, admin, django_assert_num_queries
+    ):
+        from reviews.models import Comment, Review, User
+
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        review = Review.objects.get(id=reviews[0]["id"])
+        for i in range(8):
+            author = User.objects.create(
+                username=f"author{i}", email=f"author{i}@yamdb.fake"
+            )
+            Review.objects.create(
+                title_id=titles[1]["id"], author=author, text="x", score=5
+            )
+            Comment.objects.create(review=review, author=author, text="x")
+        # Проверка родителя, COUNT для пагинации и выборка страницы
+        # вместе с авторами, произведениями и отзывами.
+        for url in (
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/comments/',
+        ):
+            with django_assert_num_queries(3):
+                response = client.get(url)
+            assert len(response.json()["results"]) >= 8, (
+                "Проверьте, что количество запросов к БД при выдаче "
+                "списка не зависит от размера страницы"
+            )
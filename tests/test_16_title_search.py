@@ -0,0 +1,72 @@
+import pytest
+
+from .common import create_titles
+
+
+class Test16TitleSearch:
+    @pytest.mark.django_db(transaction=True)
+    def test_01_search(self, client, admin_client):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        response = client.get("/api/v1/titles/?search=драма")
+        data = response.json()
+        assert response.status_code == 200
+        assert [title["id"] for title in data["results"]] == [
+            titles[1]["id"]
+        ], "Проверьте, что `search` ищет по описанию произведения"
+
+        response = client.get("/api/v1/titles/?search=поворо")
+        assert [title["id"] for title in response.json()["results"]] == [
+            titles[0]["id"]
+        ], "Проверьте, что `search` ищет по началу слова в названии"
+
+        Title.objects.filter(id=titles[0]["id"]).update(name="Разворот")
+        response = client.get("/api/v1/titles/?search=поворот")
+        assert response.json()["count"] == 0, (
+            "Проверьте, что поисковый индекс обновляется при изменении "
+            "произведения"
+        )
+        admin_client.delete(f'/api/v1/titles/{titles[1]["id"]}/')
+        response = client.get("/api/v1/titles/?search=драма")
+        assert response.json()["count"] == 0
+
+        response = client.get('/api/v1/titles/?search=" OR *')
+        assert response.status_code == 200
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_search_ranking(self, client):
+        from reviews.models import Title
+
+        Title.objects.create(
+            name="Космос", year=2000, description="Про звезды"
+        )
+        best = Title.objects.create(
+            name="Звезды", year=2000, description="Звезды и звезды"
+        )
+        response = client.get("/api/v1/titles/?search=звезды")
+        results = response.json()["results"]
+        assert len(results) == 2
+        assert results[0]["id"] == best.id, (
+            "Проверьте, что результаты `search` отсортированы по релевантности"
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_search_ignores_cursor(self, client):
+        from reviews.models import Title
+
+        Title.objects.create(
+            name="Космос", year=2000, description="Про звезды"
+        )
+        best = Title.objects.create(
+            name="Звезды", year=2000, description="Звезды и звезды"
+        )
+        response = client.get("/api/v1/titles/?search=звезды&cursor=")
+        data = response.json()
+        assert [title["id"] for title in data["results"]][0] == best.id, (
+            "Проверьте, что с `search` пагинация курсором не меняет "
+            "сортировку по релевантности"
+        )
+        assert data["count"] == 2, (
+            "Проверьте, что с `search` используется постраничная пагинация"
+        )
@@ -0,0 +1,32 @@
+import pytest
+
+
+class Test17CompositeIndexes:
+    @pytest.mark.django_db(transaction=True)
+    def test_01_hot_queries_use_indexes(self):
+        from django.db import connection
+        from reviews.models import Comment, Review, Title
+
+        if connection.vendor != "sqlite":
+            pytest.skip("План запроса проверяется для SQLite")
+        plans = {
+            "review_title_pub_date_idx": Review.objects.filter(
+                title_id=1
+            ).order_by("pub_date", "id"),
+            "comment_review_pub_date_idx": Comment.objects.filter(
+                review_id=1, review__title_id=1
+            ).order_by("pub_date", "id"),
+            "title_category_year_idx": Title.objects.filter(
+                category__slug="movie", year=1994
+            ),
+        }
+        for index, queryset in plans.items():
+            plan = queryset.explain()
+            assert index in plan, (
+                f"Проверьте, что запрос использует индекс `{index}`:\n{plan}"
+            )
+            if index != "title_category_year_idx":
+                assert "TEMP B-TREE" not in plan, (
+                    f"Проверьте, что сортировка по pub_date выполняется "
+                    f"по индексу `{index}`:\n{plan}"
+                )
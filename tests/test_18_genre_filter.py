@@ -0,0 +1,109 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_titles
+
+
+def title_ids(client, query):
+    response = client.get(f"/api/v1/titles/?{query}")
+    assert response.status_code == 200
+    return sorted(title["id"] for title in response.json()["results"])
+
+
+@pytest.fixture(params=["local", "shared"])
+def cache_mode(request):
+    # Битовые карты жанров используются только с общим кешем, с кешем
+    # в памяти процесса жанры проверяются подзапросом к БД.
+    if request.param == "shared":
+        request.getfixturevalue("shared_cache")
+    return request.param
+
+
+class Test18GenreFilter:
+    @pytest.mark.django_db(transaction=True)
+    def test_01_multiple_genres(self, client, admin_client, cache_mode):
+        titles, categories, _ = create_titles(admin_client)
+        first, second = titles[0]["id"], titles[1]["id"]
+        assert title_ids(client, "genre=horror") == [first]
+        assert title_ids(client, "genre=horror,drama") == sorted(
+            [first, second]
+        ), "Проверьте, что `genre` с несколькими slug работает как ИЛИ"
+        assert title_ids(client, "genre_all=horror,comedy") == [first], (
+            "Проверьте, что `genre_all` возвращает произведения со всеми "
+            "указанными жанрами"
+        )
+        assert title_ids(client, "genre_all=horror,drama") == []
+        assert title_ids(client, "genre=unknown") == []
+        assert title_ids(client, "genre=horror,unknown") == [first]
+        assert (
+            title_ids(
+                client,
+                f"genre=horror,drama&category={categories[1]['slug']}"
+                "&year=2020",
+            )
+            == [second]
+        )
+
+        if cache_mode == "local":
+            return
+        with CaptureQueriesContext(connection) as context:
+            client.get("/api/v1/titles/?genre=horror,drama")
+        # Первые запросы — количество и страница произведений, жанры
+        # подгружаются отдельным запросом prefetch_related.
+        assert not any(
+            "reviews_title_genre" in query["sql"]
+            for query in context.captured_queries[:2]
+        ), "Проверьте, что фильтр по жанрам не соединяет таблицы жанров"
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_index_invalidation(self, client, admin_client, cache_mode):
+        from reviews.models import Genre, Title
+
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]["id"], titles[1]["id"]
+        assert title_ids(client, "genre=drama") == [second]
+
+        admin_client.patch(
+            f"/api/v1/titles/{first}/", data={"genre": ["drama"]}
+        )
+        assert title_ids(client, "genre=drama") == sorted([first, second]), (
+            "Проверьте, что индекс жанров обновляется при изменении "
+            "жанров произведения"
+        )
+        assert title_ids(client, "genre=horror") == []
+
+        Title.objects.get(pk=second).genre.remove(
+            Genre.objects.get(slug="drama")
+        )
+        assert title_ids(client, "genre=drama") == [first]
+
+        Genre.objects.filter(slug="drama").update(slug="tragedy")
+        genre = Genre.objects.get(slug="tragedy")
+        genre.save()
+        assert title_ids(client, "genre=tragedy") == [first], (
+            "Проверьте, что индекс жанров обновляется при изменении жанра"
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_changes_from_other_process(self, client, admin_client):
+        from reviews.models import Genre, Title
+
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]["id"], titles[1]["id"]
+        assert title_ids(client, "genre=drama") == [second]
+        # bulk_create не отправляет сигналов — как запись в другом
+        # процессе, версию индекса которого этот процесс не видит.
+        Title.genre.through.objects.bulk_create(
+            [
+                Title.genre.through(
+                    title_id=first,
+                    genre_id=Genre.objects.get(slug="drama").pk,
+                )
+            ]
+        )
+        assert title_ids(client, "genre=drama") == sorted([first, second]), (
+            "Проверьте, что без общего кеша фильтр по жанрам не использует "
+            "битовые карты процесса"
+        )
+        assert title_ids(client, "genre_all=horror,drama") == [first]
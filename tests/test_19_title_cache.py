@@ -0,0 +1,80 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import auth_client, create_titles, create_users_api
+
+
+class Test19TitleCache:
+    @pytest.mark.django_db(transaction=True)
+    def test_01_cached_detail(self, client, admin_client):
+        from api.cache import title_cache
+
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        stats = title_cache.stats()
+        response = client.get(url)
+        assert response["X-Cache"] == "MISS"
+        with CaptureQueriesContext(connection) as context:
+            cached = client.get(url)
+        assert cached["X-Cache"] == "HIT", (
+            "Проверьте, что повторный запрос произведения берется из кеша"
+        )
+        assert len(context.captured_queries) == 0
+        assert cached.json() == response.json()
+        assert title_cache.stats() == {
+            "hits": stats["hits"] + 1,
+            "misses": stats["misses"] + 1,
+        }, "Проверьте счетчики попаданий и промахов кеша"
+
+        assert client.get("/api/v1/titles/abc/").status_code == 404
+
+        response = client.get(f"{url}?genre=nonexistent")
+        assert response.status_code == 404, (
+            "Проверьте, что фильтры из параметров запроса применяются "
+            "и к закешированному произведению"
+        )
+        assert not response.has_header("X-Cache")
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_invalidation(self, client, admin_client):
+        from reviews.models import Category, Genre
+
+        titles, _, _ = create_titles(admin_client)
+        user, _ = create_users_api(admin_client)
+        title_id = titles[0]["id"]
+        url = f"/api/v1/titles/{title_id}/"
+        client.get(url)
+
+        admin_client.patch(url, data={"name": "Новое название"})
+        response = client.get(url)
+        assert response["X-Cache"] == "MISS"
+        assert response.json()["name"] == "Новое название", (
+            "Проверьте, что кеш сбрасывается при изменении произведения"
+        )
+
+        auth_client(user).post(
+            f"{url}reviews/", data={"text": "Отзыв", "score": 7}
+        )
+        assert client.get(url).json()["rating"] == 7, (
+            "Проверьте, что кеш сбрасывается при добавлении отзыва"
+        )
+
+        admin_client.patch(url, data={"genre": ["drama"]})
+        assert [genre["slug"] for genre in client.get(url).json()["genre"]] == [
+            "drama"
+        ], "Проверьте, что кеш сбрасывается при изменении жанров"
+
+        Genre.objects.filter(slug="drama").update(name="Трагедия")
+        Genre.objects.get(slug="drama").save()
+        assert client.get(url).json()["genre"][0]["name"] == "Трагедия"
+
+        category = Category.objects.get(slug=titles[0]["category"])
+        category.name = "Новая категория"
+        category.save()
+        assert client.get(url).json()["category"]["name"] == (
+            "Новая категория"
+        ), "Проверьте, что кеш сбрасывается при изменении категории"
+
+        admin_client.delete(url)
+        assert client.get(url).status_code == 404
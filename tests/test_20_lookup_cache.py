@@ -0,0 +1,133 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_categories, create_genre
+
+
+class Test20LookupCache:
+    @pytest.mark.django_db(transaction=True)
+    def test_01_lists_from_cache(self, client, admin_client):
+        categories = create_categories(admin_client)
+        create_genre(admin_client)
+        for url in ("/api/v1/categories/", "/api/v1/genres/"):
+            client.get(url)
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(url)
+            assert response.status_code == 200
+            assert len(context.captured_queries) == 0, (
+                f"Проверьте, что список `{url}` берется из кеша процесса"
+            )
+
+        response = client.get("/api/v1/categories/?search=Фильм")
+        assert response.json()["count"] == 1
+
+        admin_client.delete(f'/api/v1/categories/{categories[0]["slug"]}/')
+        response = client.get("/api/v1/categories/")
+        assert [category["slug"] for category in response.json()["results"]] == [
+            categories[1]["slug"]
+        ], "Проверьте, что кеш категорий сбрасывается при удалении"
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_title_write_and_filter(self, client, admin_client):
+        categories = create_categories(admin_client)
+        genres = create_genre(admin_client)
+        data = {
+            "name": "Поворот туда",
+            "year": 2000,
+            "genre": [genres[0]["slug"], genres[1]["slug"]],
+            "category": categories[0]["slug"],
+        }
+        admin_client.post("/api/v1/titles/", data=data)
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post("/api/v1/titles/", data=data)
+        assert response.status_code == 201
+        assert not any(
+            '"reviews_category"."slug" =' in query["sql"]
+            or '"reviews_genre"."slug" =' in query["sql"]
+            for query in context.captured_queries
+        ), "Проверьте, что slug категории и жанров ищутся в кеше процесса"
+
+        admin_client.post(
+            "/api/v1/genres/", data={"name": "Мюзикл", "slug": "musical"}
+        )
+        response = admin_client.post(
+            "/api/v1/titles/",
+            data={**data, "genre": ["musical"]},
+        )
+        assert response.status_code == 201, (
+            "Проверьте, что новый жанр сразу доступен для произведений"
+        )
+        response = admin_client.post(
+            "/api/v1/titles/", data={**data, "category": "unknown"}
+        )
+        assert response.status_code == 400
+
+        response = client.get(
+            f'/api/v1/titles/?category={categories[0]["slug"]}'
+        )
+        assert response.json()["count"] == 3
+        response = client.get("/api/v1/titles/?category=unknown")
+        assert response.json()["count"] == 0
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_changes_from_other_process(
+        self, client, admin_client, settings
+    ):
+        from reviews.models import Category
+
+        create_categories(admin_client)
+        client.get("/api/v1/categories/")
+        # bulk_create не отправляет сигналов — как запись в другом
+        # процессе, версия кеша которого здесь не видна.
+        Category.objects.bulk_create([Category(name="Опера", slug="opera")])
+        response = admin_client.post(
+            "/api/v1/titles/",
+            data={"name": "Кармен", "year": 1875, "category": "opera"},
+        )
+        assert response.status_code == 201, (
+            "Проверьте, что неизвестный кешу slug ищется в БД"
+        )
+        response = client.get("/api/v1/titles/?category=opera")
+        assert response.json()["count"] == 1
+
+        Category.objects.bulk_create([Category(name="Балет", slug="ballet")])
+        settings.LOOKUP_CACHE_TTL = 0
+        response = client.get("/api/v1/categories/")
+        slugs = [category["slug"] for category in response.json()["results"]]
+        assert "ballet" in slugs, (
+            "Проверьте, что кеш категорий перечитывается по истечении "
+            "LOOKUP_CACHE_TTL"
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_deleted_in_other_process(self, client, admin_client):
+        create_categories(admin_client)
+        create_genre(admin_client)
+        client.get("/api/v1/categories/")
+        client.get("/api/v1/genres/")
+        # Удаление без сигналов — как в другом процессе: в кеше этого
+        # процесса объекты остаются.
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM reviews_category WHERE slug = 'films'")
+            cursor.execute("DELETE FROM reviews_genre WHERE slug = 'drama'")
+
+        for field, data in (
+            ("category", {"category": "films", "genre": ["horror"]}),
+            ("genre", {"category": "books", "genre": ["horror", "drama"]}),
+        ):
+            response = admin_client.post(
+                "/api/v1/titles/",
+                data={"name": "Кармен", "year": 1875, **data},
+            )
+            assert response.status_code == 400, (
+                "Проверьте, что удаленный в другом процессе объект из кеша "
+                "не принимается при записи"
+            )
+            assert field in response.json()
+
+        response = client.get("/api/v1/categories/")
+        slugs = [category["slug"] for category in response.json()["results"]]
+        assert slugs == ["books"], (
+            "Проверьте, что кеш сбрасывается, если объект не найден в БД"
+        )
@@ -0,0 +1,109 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_comments, create_reviews
+
+
+class Test21ConditionalGet:
+    @pytest.mark.django_db(transaction=True)
+    def test_01_not_modified(
+        self, client, admin_client, admin, shared_cache
+    ):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        title_id = titles[0]["id"]
+        urls = (
+            "/api/v1/titles/",
+            f"/api/v1/titles/{title_id}/",
+            f"/api/v1/titles/{title_id}/reviews/",
+            f"/api/v1/titles/{title_id}/reviews/{reviews[0]['id']}/",
+        )
+        for url in urls:
+            response = client.get(url)
+            assert response.status_code == 200
+            assert response.has_header("ETag"), (
+                f"Проверьте, что ответ `{url}` содержит заголовок ETag"
+            )
+            assert response.has_header("Last-Modified")
+            with CaptureQueriesContext(connection) as context:
+                cached = client.get(
+                    url, HTTP_IF_NONE_MATCH=response["ETag"]
+                )
+            assert cached.status_code == 304, (
+                f"Проверьте, что `{url}` отвечает 304 на If-None-Match"
+            )
+            assert len(context.captured_queries) == 0
+            cached = client.get(
+                url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+            )
+            assert cached.status_code == 304, (
+                f"Проверьте, что `{url}` отвечает 304 на If-Modified-Since"
+            )
+
+        response = client.get("/api/v1/titles/?limit=1")
+        assert response["ETag"] != client.get("/api/v1/titles/")["ETag"], (
+            "Проверьте, что ETag зависит от параметров запроса"
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_modified(self, client, admin_client, admin, shared_cache):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        title_id = titles[0]["id"]
+        reviews_url = f"/api/v1/titles/{title_id}/reviews/"
+        comments_url = f"{reviews_url}{reviews[0]['id']}/comments/"
+        etags = {
+            url: client.get(url)["ETag"]
+            for url in ("/api/v1/titles/", reviews_url, comments_url)
+        }
+
+        def modified(url):
+            return (
+                client.get(url, HTTP_IF_NONE_MATCH=etags[url]).status_code
+                == 200
+            )
+
+        admin_client.patch(
+            f"{comments_url}{comments[0]['id']}/", data={"text": "Новый"}
+        )
+        assert modified(comments_url), (
+            "Проверьте, что изменение комментария меняет ETag списка"
+        )
+        assert not modified(reviews_url)
+
+        admin_client.patch(
+            f"{reviews_url}{reviews[0]['id']}/", data={"text": "Новый"}
+        )
+        assert modified(reviews_url), (
+            "Проверьте, что изменение отзыва меняет ETag списка отзывов"
+        )
+        assert modified("/api/v1/titles/"), (
+            "Проверьте, что изменение отзыва меняет ETag списка произведений"
+        )
+
+        etag = client.get(reviews_url)["ETag"]
+        admin.bio = "Новая биография"
+        admin.save()
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            "Проверьте, что изменение полей пользователя, которых нет "
+            "в ответах, не меняет ETag"
+        )
+        admin.username = "RenamedAdmin"
+        admin.save()
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            "Проверьте, что смена имени автора меняет ETag списка отзывов"
+        )
+        assert "RenamedAdmin" in [
+            review["author"] for review in response.json()["results"]
+        ]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_process_local_cache(self, client, admin_client, admin):
+        create_reviews(admin_client, admin)
+        response = client.get("/api/v1/titles/")
+        assert response.status_code == 200
+        assert not response.has_header("ETag"), (
+            "Проверьте, что с кешем в памяти процесса условные запросы "
+            "отключены"
+        )
@@ -0,0 +1,73 @@
+import io
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+
+
+class Test22JSONRenderer:
+    def test_01_same_output(self):
+        from rest_framework.renderers import JSONRenderer
+
+        from api.renderers import ORJSONRenderer
+
+        data = {
+            "text": "Отзыв \u2028 строки",
+            "score": Decimal("7.5"),
+            "rating": 7.25,
+            "pub_date": datetime(2022, 1, 2, 3, 4, 5, 678901, timezone.utc),
+            "detail": gettext_lazy("Not found."),
+            1: [None, True, {"nested": []}],
+        }
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data), (
+            "Проверьте, что ORJSONRenderer отдает тот же JSON, что и "
+            "JSONRenderer"
+        )
+        assert ORJSONRenderer().render(None) == b""
+        media_type = "application/json; indent=4"
+        assert ORJSONRenderer().render(
+            data, media_type
+        ) == JSONRenderer().render(data, media_type)
+
+    def test_02_parser(self):
+        from rest_framework.exceptions import ParseError
+
+        from api.parsers import ORJSONParser
+
+        data = ORJSONParser().parse(
+            io.BytesIO('{"text": "Отзыв", "score": 5}'.encode())
+        )
+        assert data == {"text": "Отзыв", "score": 5}
+        data = ORJSONParser().parse(
+            io.BytesIO('{"text": "Отзыв"}'.encode("cp1251")),
+            parser_context={"encoding": "cp1251"},
+        )
+        assert data == {"text": "Отзыв"}
+        with pytest.raises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"text": '))
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_api_json(self, admin_client):
+        response = admin_client.post(
+            "/api/v1/genres/",
+            data='{"name": "Драма", "slug": "drama"}',
+            content_type="application/json",
+        )
+        assert response.status_code == 201
+        assert response["Content-Type"] == "application/json"
+        assert response.json() == {"name": "Драма", "slug": "drama"}
+        response = admin_client.post(
+            "/api/v1/genres/", data="{", content_type="application/json"
+        )
+        assert response.status_code == 400
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_benchmark(self):
+        out = io.StringIO()
+        call_command(
+            "benchmark_renderers", current_db=True, repeat=2, stdout=out
+        )
+        assert "titles" in out.getvalue() and "reviews" in out.getvalue()
@@ -0,0 +1,101 @@
+import io
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+
+
+def responses(client, urls):
+    # Кеш ответов произведений сбрасывается, чтобы оба варианта
+    # сериализации строили ответ заново.
+    cache.clear()
+    return {url: client.get(url).json() for url in urls}
+
+
+class Test23FastSerializers:
+    @pytest.mark.django_db(transaction=True)
+    def test_01_same_output(self, client, monkeypatch):
+        from api.views import CommentViewSet, ReviewViewSet, TitleViewSet
+        from reviews.models import Comment, Genre, Review, Title
+
+        call_command(
+            "generate_data",
+            stdout=io.StringIO(),
+            users=20,
+            categories=3,
+            genres=5,
+            titles=30,
+            reviews=200,
+            comments=200,
+            seed=7,
+        )
+        Title.objects.filter(pk=1).update(category=None, rating=None)
+        genre = Genre.objects.order_by("pk").first()
+        title = Title.objects.order_by("-rating_count", "pk").first()
+        review = Review.objects.filter(title=title).order_by("pk").first()
+        comment = Comment.objects.order_by("pk").first()
+        titles = "/api/v1/titles/"
+        reviews = f"{titles}{title.pk}/reviews/"
+        comments = (
+            f"{titles}{comment.review.title_id}/reviews/"
+            f"{comment.review_id}/comments/"
+        )
+        urls = [
+            titles,
+            f"{titles}?page=2",
+            f"{titles}?cursor=",
+            f"{titles}?genre={genre.slug}&year=2000",
+            f"{titles}?search=произведение",
+            f"{titles}1/",
+            f"{titles}{title.pk}/",
+            f"{titles}999999/",
+            reviews,
+            f"{reviews}?cursor=",
+            f"{reviews}{review.pk}/",
+            f"{reviews}999999/",
+            comments,
+            f"{comments}?cursor=",
+            f"{comments}{comment.pk}/",
+            f"{comments}999999/",
+        ]
+        fast = responses(client, urls)
+        for viewset in (TitleViewSet, ReviewViewSet, CommentViewSet):
+            monkeypatch.setattr(viewset, "fast_serializer_class", None)
+        slow = responses(client, urls)
+        for url in urls:
+            assert fast[url] == slow[url], (
+                f"Проверьте, что быстрый ответ `{url}` совпадает с ответом "
+                "сериализатора"
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_stale_process_cache(self, client):
+        from api.cache import categories, genres
+        from reviews.models import Category, Genre, Title
+
+        Category.objects.create(name="Фильм", slug="movie")
+        Genre.objects.create(name="Драма", slug="drama")
+        categories.all()
+        genres.all()
+        # bulk_create не отправляет сигналов — как запись в другом
+        # процессе, которую кеш этого процесса еще не видит.
+        Category.objects.bulk_create([Category(name="Балет", slug="ballet")])
+        Genre.objects.bulk_create([Genre(name="Мюзикл", slug="musical")])
+        title = Title.objects.create(
+            name="Жизель",
+            year=1841,
+            category=Category.objects.get(slug="ballet"),
+        )
+        title.genre.add(Genre.objects.get(slug="musical"))
+
+        for url in ("/api/v1/titles/", f"/api/v1/titles/{title.pk}/"):
+            data = client.get(url).json()
+            data = data["results"][0] if "results" in data else data
+            assert data["category"] == {"name": "Балет", "slug": "ballet"}, (
+                f"Проверьте, что `{url}` загружает из БД категорию, "
+                "которой еще нет в кеше процесса"
+            )
+            assert data["genre"] == [{"name": "Мюзикл", "slug": "musical"}], (
+                f"Проверьте, что `{url}` загружает из БД жанр, "
+                "которого еще нет в кеше процесса"
+            )
@@ -0,0 +1,184 @@
+import io
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+
+class FailingBackend(EmailBackend):
+    """
+    Не отправляет письма на адреса из домена fail.fake.
+    """
+
+    opened = 0
+
+    def open(self):
+        FailingBackend.opened += 1
+        return super().open()
+
+    def send_messages(self, messages):
+        for message in messages:
+            if message.to[0].endswith("@fail.fake"):
+                raise ConnectionError("Сервер недоступен")
+        return super().send_messages(messages)
+
+
+class CrashingBackend(EmailBackend):
+    """
+    Обрывает процесс отправки на адресе из домена crash.fake.
+    """
+
+    def send_messages(self, messages):
+        for message in messages:
+            if message.to[0].endswith("@crash.fake"):
+                raise SystemExit("Процесс остановлен")
+        return super().send_messages(messages)
+
+
+def create_emails(*addresses):
+    from reviews.models import OutgoingEmail
+
+    OutgoingEmail.objects.bulk_create(
+        OutgoingEmail(
+            subject="Код",
+            body="0000",
+            from_email="support_api@mail.com",
+            to_email=address,
+        )
+        for address in addresses
+    )
+
+
+def send_emails(**options):
+    call_command(
+        "send_emails", stdout=io.StringIO(), stderr=io.StringIO(), **options
+    )
+
+
+class Test24EmailOutbox:
+    @pytest.mark.django_db(transaction=True)
+    def test_01_signup_queues_email(self, client):
+        from reviews.models import OutgoingEmail
+
+        outbox_before_count = len(mail.outbox)
+        client.post(
+            "/api/v1/auth/signup/",
+            data={"username": "queued", "email": "queued@yamdb.fake"},
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.to_email == "queued@yamdb.fake"
+        assert email.sent_at is None
+        assert len(mail.outbox) == outbox_before_count
+
+        send_emails()
+        email.refresh_from_db()
+        assert email.sent_at is not None
+        assert len(mail.outbox) == outbox_before_count + 1
+        send_emails()
+        assert len(mail.outbox) == outbox_before_count + 1, (
+            "Проверьте, что отправленное письмо не отправляется повторно"
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    @override_settings(
+        EMAIL_BACKEND="tests.test_24_email_outbox.FailingBackend"
+    )
+    def test_02_batches_and_retries(self):
+        from reviews.models import OutgoingEmail
+
+        OutgoingEmail.objects.bulk_create(
+            OutgoingEmail(
+                subject="Код",
+                body="0000",
+                from_email="support_api@mail.com",
+                to_email=f"user{i}@{'fail' if i == 0 else 'yamdb'}.fake",
+            )
+            for i in range(5)
+        )
+        outbox_before_count = len(mail.outbox)
+        FailingBackend.opened = 0
+        send_emails(batch_size=2, backoff=60)
+        assert len(mail.outbox) == outbox_before_count + 4
+        assert FailingBackend.opened == 3, (
+            "Проверьте, что пачка писем отправляется через одно соединение"
+        )
+
+        failed = OutgoingEmail.objects.get(sent_at__isnull=True)
+        assert failed.attempts == 1
+        assert failed.last_error == "Сервер недоступен"
+        assert failed.next_attempt_at > timezone.now() + timedelta(seconds=50)
+
+        send_emails()
+        failed.refresh_from_db()
+        assert failed.attempts == 1, (
+            "Проверьте, что повторная попытка ждет окончания задержки"
+        )
+
+        OutgoingEmail.objects.filter(pk=failed.pk).update(
+            next_attempt_at=timezone.now()
+        )
+        send_emails(backoff=60)
+        failed.refresh_from_db()
+        assert failed.attempts == 2
+        assert failed.next_attempt_at > timezone.now() + timedelta(
+            seconds=110
+        ), "Проверьте, что задержка растет с каждой попыткой"
+
+        OutgoingEmail.objects.filter(pk=failed.pk).update(
+            next_attempt_at=timezone.now()
+        )
+        send_emails(max_attempts=2)
+        failed.refresh_from_db()
+        assert failed.attempts == 2, (
+            "Проверьте, что после max_attempts письмо не отправляется"
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_claimed_emails(self):
+        import uuid
+
+        from reviews.models import OutgoingEmail
+
+        create_emails("first@yamdb.fake", "second@yamdb.fake")
+        first = OutgoingEmail.objects.get(to_email="first@yamdb.fake")
+        OutgoingEmail.objects.filter(pk=first.pk).update(
+            claim_token=uuid.uuid4(), claimed_at=timezone.now()
+        )
+        outbox_before_count = len(mail.outbox)
+        send_emails()
+        sent = [message.to for message in mail.outbox[outbox_before_count:]]
+        assert sent == [["second@yamdb.fake"]], (
+            "Проверьте, что письмо, взятое другим запуском, не отправляется"
+        )
+
+        OutgoingEmail.objects.filter(pk=first.pk).update(
+            claimed_at=timezone.now() - timedelta(seconds=120)
+        )
+        send_emails(lease=60)
+        assert len(mail.outbox) == outbox_before_count + 2, (
+            "Проверьте, что письмо упавшего отправителя берется снова "
+            "после окончания lease"
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    @override_settings(
+        EMAIL_BACKEND="tests.test_24_email_outbox.CrashingBackend"
+    )
+    def test_04_crash_in_batch(self):
+        from reviews.models import OutgoingEmail
+
+        create_emails("first@yamdb.fake", "stop@crash.fake", "last@yamdb.fake")
+        with pytest.raises(SystemExit):
+            send_emails()
+        assert list(
+            OutgoingEmail.objects.filter(sent_at__isnull=False).values_list(
+                "to_email", flat=True
+            )
+        ) == ["first@yamdb.fake"], (
+            "Проверьте, что письмо отмечается отправленным сразу после "
+            "отправки"
+        )
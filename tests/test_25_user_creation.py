@@ -0,0 +1,48 @@
+import pytest
+
+
+class Test25UserCreation:
+    @pytest.mark.django_db(transaction=True)
+    def test_01_single_insert(self, django_assert_num_queries):
+        from reviews.models import User
+
+        with django_assert_num_queries(1):
+            user = User.objects.create(
+                username="single", email="single@yamdb.fake"
+            )
+        user.refresh_from_db()
+        assert user.confirmation_code and len(user.confirmation_code) == 4, (
+            "Проверьте, что код подтверждения создается вместе "
+            "с пользователем"
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_bulk_create(self):
+        from reviews.models import User
+
+        User.objects.bulk_create(
+            User(username=f"bulk{i}", email=f"bulk{i}@yamdb.fake")
+            for i in range(3)
+        )
+        codes = User.objects.values_list("confirmation_code", flat=True)
+        assert all(codes) and len(codes) == 3, (
+            "Проверьте, что пользователи из bulk_create получают код "
+            "подтверждения"
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_signup_and_token(self, client):
+        from reviews.models import User
+
+        data = {"username": "signup", "email": "signup@yamdb.fake"}
+        client.post("/api/v1/auth/signup/", data=data)
+        user = User.objects.get(username="signup")
+        response = client.post(
+            "/api/v1/auth/token/",
+            data={
+                "username": "signup",
+                "confirmation_code": user.confirmation_code,
+            },
+        )
+        assert response.status_code == 201
+        assert "token" in response.json()
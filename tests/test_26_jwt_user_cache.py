@@ -0,0 +1,44 @@
+import pytest
+from django.test import override_settings
+
+from .common import auth_client
+
+
+class Test26JWTUserCache:
+    @pytest.mark.django_db(transaction=True)
+    def test_01_cached_user(self, admin, django_assert_num_queries):
+        from reviews.models import User
+
+        client = auth_client(admin)
+        assert client.get("/api/v1/genres/").status_code == 200
+        with django_assert_num_queries(0):
+            response = client.get("/api/v1/genres/")
+        assert response.status_code == 200, (
+            "Проверьте, что пользователь из токена берется из кеша"
+        )
+
+        User.objects.filter(pk=admin.pk).update(role="user")
+        admin.refresh_from_db()
+        admin.save()
+        response = client.post(
+            "/api/v1/genres/", data={"name": "Драма", "slug": "drama"}
+        )
+        assert response.status_code == 403, (
+            "Проверьте, что кеш пользователя сбрасывается при сохранении"
+        )
+
+        client.patch("/api/v1/users/me/", data={"bio": "Новая биография"})
+        assert client.get("/api/v1/users/me/").json()["bio"] == (
+            "Новая биография"
+        )
+
+        admin.delete()
+        assert client.get("/api/v1/users/me/").status_code == 401
+
+    @pytest.mark.django_db(transaction=True)
+    @override_settings(JWT_USER_CACHE_TTL=0)
+    def test_02_disabled(self, admin, django_assert_num_queries):
+        client = auth_client(admin)
+        client.get("/api/v1/genres/")
+        with django_assert_num_queries(1):
+            client.get("/api/v1/genres/")
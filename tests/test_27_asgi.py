@@ -0,0 +1,115 @@
+import asyncio
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+
+from .common import create_titles
+
+
+def asgi_request(method, path, body=b"", headers=()):
+    from django.core.handlers.wsgi import WSGIHandler
+
+    from api.asgi import ASGIHandler
+
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "query_string": query.encode(),
+        "http_version": "1.1",
+        "headers": [(b"host", b"testserver"), *headers],
+    }
+    chunks = [body[:5], body[5:]]
+    messages = []
+
+    async def receive():
+        chunk = chunks.pop(0)
+        return {"type": "http.request", "body": chunk, "more_body": chunks}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(ASGIHandler(WSGIHandler())(scope, receive, send))
+    start, response_body = messages
+    return start["status"], dict(start["headers"]), response_body["body"]
+
+
+class Test27ASGI:
+    @pytest.mark.django_db(transaction=True)
+    def test_01_read_endpoints(self, client, admin_client):
+        titles, _, genres = create_titles(admin_client)
+        title = titles[0]
+        for path in (
+            "/api/v1/titles/",
+            f"/api/v1/titles/?genre={genres[0]['slug']}",
+            f"/api/v1/titles/{title['id']}/",
+            f"/api/v1/titles/{title['id']}/reviews/",
+            "/api/v1/titles/0/",
+        ):
+            expected = client.get(path)
+            status, headers, body = asgi_request("GET", path)
+            assert status == expected.status_code, (
+                f"Проверьте, что ASGI-приложение отвечает на GET {path} "
+                "так же, как WSGI"
+            )
+            assert json.loads(body) == expected.json()
+            assert headers[b"content-type"] == b"application/json"
+
+        status, headers, body = asgi_request("HEAD", "/api/v1/titles/")
+        assert (
+            status == 200 and body == b""
+        ), "Проверьте, что на HEAD-запрос тело ответа не отправляется"
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_request_body(self):
+        from reviews.models import User
+
+        status, _, body = asgi_request(
+            "POST",
+            "/api/v1/auth/signup/",
+            body=b'{"username": "asgi", "email": "asgi@yamdb.fake"}',
+            headers=[(b"content-type", b"application/json")],
+        )
+        assert status == 200, body
+        assert User.objects.filter(username="asgi").exists(), (
+            "Проверьте, что тело запроса из нескольких сообщений "
+            "передается представлению целиком"
+        )
+
+    def test_03_lifespan(self):
+        from django.core.handlers.wsgi import WSGIHandler
+
+        from api.asgi import ASGIHandler
+
+        events = ["lifespan.startup", "lifespan.shutdown"]
+        sent = []
+
+        async def receive():
+            return {"type": events.pop(0)}
+
+        async def send(message):
+            sent.append(message["type"])
+
+        asyncio.run(
+            ASGIHandler(WSGIHandler())({"type": "lifespan"}, receive, send)
+        )
+        assert sent == [
+            "lifespan.startup.complete",
+            "lifespan.shutdown.complete",
+        ]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_benchmark(self):
+        out = io.StringIO()
+        call_command(
+            "benchmark_asgi",
+            current_db=True,
+            clients=4,
+            requests=2,
+            client_delay=0,
+            stdout=out,
+        )
+        assert "wsgi" in out.getvalue() and "asgi" in out.getvalue()
@@ -0,0 +1,95 @@
+import io
+import sqlite3
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+
+class Test28SQLitePragmas:
+    @pytest.mark.django_db(transaction=True)
+    def test_01_connection_pragmas(self):
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA synchronous")
+            synchronous = cursor.fetchone()[0]
+            cursor.execute("PRAGMA busy_timeout")
+            busy_timeout = cursor.fetchone()[0]
+            cursor.execute("PRAGMA cache_size")
+            cache_size = cursor.fetchone()[0]
+        assert (
+            synchronous == 1
+        ), "Проверьте, что соединение с SQLite работает с synchronous=NORMAL"
+        assert busy_timeout == 5000
+        assert cache_size == -65536
+
+    def test_02_apply_pragmas(self, tmp_path):
+        from api.sqlite import apply_pragmas
+
+        db = sqlite3.connect(str(tmp_path / "db.sqlite3"))
+        apply_pragmas(
+            db, {"journal_mode": "wal", "mmap_size": "", "synchronous": None}
+        )
+        assert (
+            db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        ), "Проверьте, что для файла БД включается режим WAL"
+        assert (
+            db.execute("PRAGMA synchronous").fetchone()[0] == 2
+        ), "Проверьте, что пустые значения оставляют умолчание SQLite"
+        db.close()
+
+    def test_03_validation(self):
+        from django.core.exceptions import ImproperlyConfigured
+
+        from api.sqlite import validate_pragmas
+
+        assert validate_pragmas(
+            {"journal_mode": "WAL", "cache_size": "-2000", "mmap_size": ""}
+        ) == {"journal_mode": "wal", "cache_size": -2000}
+        for pragmas in (
+            {"journal_mode": "wal; DROP TABLE reviews_title"},
+            {"synchronous": "sometimes"},
+            {"busy_timeout": "5s"},
+            {"page_size": "4096"},
+        ):
+            with pytest.raises(ImproperlyConfigured):
+                validate_pragmas(pragmas)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_journal_mode_after_migrate(self, tmp_path):
+        from django.db import connections
+
+        from api.sqlite import setup_journal_mode
+
+        # Режим WAL возможен только у БД в файле.
+        connections.databases["file"] = {
+            **connections.databases["default"],
+            "NAME": str(tmp_path / "db.sqlite3"),
+        }
+        try:
+            with connections["file"].cursor() as cursor:
+                cursor.execute("PRAGMA journal_mode")
+                assert cursor.fetchone()[0] == "delete", (
+                    "Проверьте, что режим журнала не меняется при каждом "
+                    "соединении"
+                )
+            setup_journal_mode(using="file")
+            with connections["file"].cursor() as cursor:
+                cursor.execute("PRAGMA journal_mode")
+                assert cursor.fetchone()[0] == "wal"
+        finally:
+            connections["file"].close()
+            del connections["file"]
+            del connections.databases["file"]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_benchmark(self):
+        out = io.StringIO()
+        call_command(
+            "benchmark_sqlite",
+            current_db=True,
+            duration=0.2,
+            readers=1,
+            writers=1,
+            stdout=out,
+        )
+        assert "default" in out.getvalue() and "tuned" in out.getvalue()